@@ -7,15 +7,26 @@ It supports multiple data sources including DEMs, land cover maps, and building
 """
 
 # Earth Engine and geospatial imports
+import threading
 import ee
 import geemap
 
 # Local imports
 # from ..geo.utils import convert_format_lat_lon
 
+# Module-level flag so repeated calls skip the (slow) API handshake; the
+# lock keeps initialization single-shot when grid fetches run in threads
+_EE_INITIALIZED = False
+_EE_INIT_LOCK = threading.Lock()
+
 def initialize_earth_engine():
-    """Initialize the Earth Engine API."""
-    ee.Initialize()
+    """Initialize the Earth Engine API (no-op after the first call)."""
+    global _EE_INITIALIZED
+    if not _EE_INITIALIZED:
+        with _EE_INIT_LOCK:
+            if not _EE_INITIALIZED:
+                ee.Initialize()
+                _EE_INITIALIZED = True
 
 def get_roi(input_coords):
     """Create an Earth Engine region of interest polygon from coordinates.
@@ -9,6 +9,7 @@ coordinate transformations, spatial filtering, and height data extraction from v
 # Required imports for GIS operations, data manipulation and file handling
 import geopandas as gpd
 import json
+import shapely
 from shapely.geometry import Polygon, Point, shape
 from shapely.errors import GEOSException, ShapelyError
 import pandas as pd
@@ -99,23 +100,103 @@ def filter_and_convert_gdf_to_geojson(gdf, rectangle_vertices):
 
     return geojson["features"]
 
-def get_geojson_from_gpkg(gpkg_path, rectangle_vertices):
+def get_geojson_from_gpkg(gpkg_path, rectangle_vertices, engine="pyogrio"):
     """
     Read a GeoPackage file and convert it to GeoJSON format within a bounding rectangle.
     
     Args:
         gpkg_path (str): Path to the GeoPackage file
         rectangle_vertices (list): List of (lon, lat) tuples defining the bounding rectangle
+        engine (str): IO engine for geopandas; pyogrio reads features as
+            batched arrays instead of fiona's per-feature iteration
         
     Returns:
         list: List of GeoJSON features within the bounding rectangle
     """
     # Open and read the GPKG file
     print(f"Opening GPKG file: {gpkg_path}")
-    gdf = gpd.read_file(gpkg_path)
+    gdf = gpd.read_file(gpkg_path, engine=engine)
     geojson = filter_and_convert_gdf_to_geojson(gdf, rectangle_vertices)
     return geojson
 
+_MORTON_GRID_BITS = 8  # 256 x 256 buckets over the reference extent
+
+def _interleave_bits(v):
+    """Spread the lower 16 bits of each value so a bit of the other axis fits between them."""
+    v = (v | (v << 8)) & 0x00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F
+    v = (v | (v << 2)) & 0x33333333
+    v = (v | (v << 1)) & 0x55555555
+    return v
+
+def _morton_keys(cx, cy):
+    """Z-order curve key for integer bucket coordinates."""
+    return (_interleave_bits(np.asarray(cy, dtype=np.int64)) << 1) | _interleave_bits(np.asarray(cx, dtype=np.int64))
+
+def _build_morton_index(geometries):
+    """Build a sorted Z-curve bucket index over geometry bounding boxes.
+
+    Linearizes the 2D extent into a 256x256 bucket grid, emits one
+    (morton_key, geometry_index) pair per bucket each bounding box covers
+    and sorts the pairs by key, so bucket lookups become binary searches
+    on a flat int64 array instead of pairwise geometry tests.
+
+    Args:
+        geometries (list): Shapely geometries to index
+
+    Returns:
+        tuple: (sorted_keys, geometry_indices, extent, scale) where extent
+            is (xmin, ymin) and scale converts coordinates to bucket units
+    """
+    bounds = shapely.bounds(np.array(geometries, dtype=object))
+    cells = 1 << _MORTON_GRID_BITS
+    xmin, ymin = bounds[:, 0].min(), bounds[:, 1].min()
+    xmax, ymax = bounds[:, 2].max(), bounds[:, 3].max()
+    scale = (cells / max(xmax - xmin, 1e-12), cells / max(ymax - ymin, 1e-12))
+
+    cx0 = np.clip(((bounds[:, 0] - xmin) * scale[0]).astype(np.int64), 0, cells - 1)
+    cy0 = np.clip(((bounds[:, 1] - ymin) * scale[1]).astype(np.int64), 0, cells - 1)
+    cx1 = np.clip(((bounds[:, 2] - xmin) * scale[0]).astype(np.int64), 0, cells - 1)
+    cy1 = np.clip(((bounds[:, 3] - ymin) * scale[1]).astype(np.int64), 0, cells - 1)
+
+    keys = []
+    owners = []
+    for idx in range(len(geometries)):
+        for cy in range(cy0[idx], cy1[idx] + 1):
+            for cx in range(cx0[idx], cx1[idx] + 1):
+                keys.append((cy, cx))
+                owners.append(idx)
+    if not keys:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), (xmin, ymin), scale
+    keys = np.array(keys, dtype=np.int64)
+    flat_keys = _morton_keys(keys[:, 1], keys[:, 0])
+    owners = np.array(owners, dtype=np.int64)
+    order = np.argsort(flat_keys, kind='stable')
+    return flat_keys[order], owners[order], (xmin, ymin), scale
+
+def _query_morton_index(morton_index, query_bounds):
+    """Return candidate geometry indices whose buckets overlap the query box."""
+    sorted_keys, owners, (xmin, ymin), scale = morton_index
+    if sorted_keys.size == 0:
+        return np.empty(0, dtype=np.int64)
+    cells = 1 << _MORTON_GRID_BITS
+    cx0 = min(max(int((query_bounds[0] - xmin) * scale[0]), 0), cells - 1)
+    cy0 = min(max(int((query_bounds[1] - ymin) * scale[1]), 0), cells - 1)
+    cx1 = min(max(int((query_bounds[2] - xmin) * scale[0]), 0), cells - 1)
+    cy1 = min(max(int((query_bounds[3] - ymin) * scale[1]), 0), cells - 1)
+
+    candidates = []
+    for cy in range(cy0, cy1 + 1):
+        row_keys = _morton_keys(np.arange(cx0, cx1 + 1), cy)
+        lo = np.searchsorted(sorted_keys, row_keys, side='left')
+        hi = np.searchsorted(sorted_keys, row_keys, side='right')
+        for a, b in zip(lo, hi):
+            if b > a:
+                candidates.append(owners[a:b])
+    if not candidates:
+        return np.empty(0, dtype=np.int64)
+    return np.unique(np.concatenate(candidates))
+
 def extract_building_heights_from_geojson(geojson_data_0: List[Dict], geojson_data_1: List[Dict]) -> List[Dict]:
     """
     Extract building heights from one GeoJSON dataset and apply them to another based on spatial overlap.
@@ -134,6 +215,11 @@ def extract_building_heights_from_geojson(geojson_data_0: List[Dict], geojson_da
         height = feature['properties']['height']
         reference_buildings.append((geom, height))
 
+    # Z-curve bucket index over the reference footprints: each primary
+    # building only tests the references sharing its buckets instead of
+    # every reference in the dataset
+    morton_index = _build_morton_index([geom for geom, _ in reference_buildings]) if reference_buildings else None
+
     # Initialize counters for statistics
     count_0 = 0  # Buildings without height
     count_1 = 0  # Buildings updated with height
@@ -149,7 +235,8 @@ def extract_building_heights_from_geojson(geojson_data_0: List[Dict], geojson_da
             # Calculate weighted average height based on overlapping areas
             overlapping_height_area = 0
             overlapping_area = 0
-            for ref_geom, ref_height in reference_buildings:
+            candidates = _query_morton_index(morton_index, geom.bounds) if morton_index else ()
+            for ref_geom, ref_height in (reference_buildings[c] for c in candidates):
                 try:
                     if geom.intersects(ref_geom):
                         overlap_area = geom.intersection(ref_geom).area
@@ -548,7 +635,8 @@ def filter_buildings(geojson_data, plotting_box):
     Returns:
         list: Filtered list of GeoJSON features that intersect with the bounding box
     """
-    filtered_features = []
+    candidate_features = []
+    candidate_geoms = []
     for feature in geojson_data:
         # Validate polygon coordinates before processing
         if not validate_polygon_coordinates(feature['geometry']):
@@ -558,16 +646,24 @@ def filter_buildings(geojson_data, plotting_box):
         try:
             # Convert GeoJSON geometry to Shapely geometry
             geom = shape(feature['geometry'])
-            if not geom.is_valid:
-                print("Skipping invalid geometry")
-                print(geom)
-                continue
-            # Keep features that intersect with bounding box
-            if plotting_box.intersects(geom):
-                filtered_features.append(feature)
         except ShapelyError as e:
             print(f"Skipping feature due to geometry error: {e}")
-    return filtered_features
+            continue
+        candidate_features.append(feature)
+        candidate_geoms.append(geom)
+
+    if not candidate_features:
+        return []
+
+    # Run the validity and intersection predicates over all geometries at
+    # once instead of one GEOS call per feature
+    geoms = np.array(candidate_geoms, dtype=object)
+    valid = shapely.is_valid(geoms)
+    for geom in geoms[~valid]:
+        print("Skipping invalid geometry")
+        print(geom)
+    keep = valid & shapely.intersects(geoms, plotting_box)
+    return [feature for feature, kept in zip(candidate_features, keep) if kept]
 
 def extract_building_heights_from_geotiff(geotiff_path, geojson_data):
     """
@@ -639,20 +735,22 @@ def extract_building_heights_from_geotiff(geotiff_path, geojson_data):
     else:
         return geojson
 
-def get_geojson_from_gpkg(gpkg_path, rectangle_vertices):
+def get_geojson_from_gpkg(gpkg_path, rectangle_vertices, engine="pyogrio"):
     """
     Read a GeoPackage file and convert it to GeoJSON format within a bounding rectangle.
     
     Args:
         gpkg_path (str): Path to the GeoPackage file
         rectangle_vertices (list): List of (lon, lat) tuples defining the bounding rectangle
+        engine (str): IO engine for geopandas; pyogrio reads features as
+            batched arrays instead of fiona's per-feature iteration
         
     Returns:
         list: List of GeoJSON features within the bounding rectangle
     """
     # Open and read the GPKG file
     print(f"Opening GPKG file: {gpkg_path}")
-    gdf = gpd.read_file(gpkg_path)
+    gdf = gpd.read_file(gpkg_path, engine=engine)
     geojson = filter_and_convert_gdf_to_geojson(gdf, rectangle_vertices)
     return geojson
 
@@ -4,7 +4,9 @@ This module provides functions for creating and manipulating grids of building h
 
 import numpy as np
 import os
+import shapely
 from shapely.geometry import Polygon, box
+from numba import njit, prange
 from scipy.ndimage import label, generate_binary_structure
 from pyproj import Geod, Transformer, CRS
 import rasterio
@@ -14,6 +16,7 @@ from scipy.interpolate import griddata
 from shapely.errors import GEOSException
 import geopandas as gpd
 
+from .raster import rasterize_buildings_scanline
 from .utils import (
     initialize_geod,
     calculate_distance,
@@ -89,20 +92,14 @@ def group_and_label_cells(array):
     Returns:
         numpy.ndarray: Array with non-zero values converted to sequential IDs
     """
-    # Create a copy to avoid modifying input
-    result = array.copy()
-    
-    # Get sorted set of unique non-zero values
-    unique_values = sorted(set(array.flatten()) - {0})
-    
-    # Create mapping from original values to sequential IDs (1, 2, 3, etc)
-    value_to_id = {value: idx + 1 for idx, value in enumerate(unique_values)}
-    
-    # Replace each non-zero value with its new sequential ID
-    for value in unique_values:
-        result[array == value] = value_to_id[value]
-    
-    return result
+    # Sort the distinct values once and map each cell to its rank; zeros keep
+    # ID 0 and the non-zero values get sequential IDs in sorted order, the
+    # same assignment the old per-value masking loop produced
+    unique_values, inverse = np.unique(array, return_inverse=True)
+    ids = np.zeros(unique_values.size, dtype=np.int64)
+    nonzero = unique_values != 0
+    ids[nonzero] = np.arange(1, np.count_nonzero(nonzero) + 1)
+    return ids[inverse].reshape(array.shape).astype(array.dtype, copy=False)
 
 def process_grid(grid_bi, dem_grid):
     """
@@ -125,8 +122,9 @@ def process_grid(grid_bi, dem_grid):
         avg_value = np.mean(dem_grid[mask])
         result[mask] = avg_value
     
-    # Normalize by subtracting minimum value
-    return result - np.min(result)
+    # Normalize by subtracting minimum value (in place; result is our copy)
+    result -= np.min(result)
+    return result
 
 def calculate_grid_size(side_1, side_2, u_vec, v_vec, meshsize):
     """
@@ -236,73 +234,94 @@ def tree_height_grid_from_land_cover(land_cover_grid_ori):
 
     return tree_height_grid
 
+def create_land_cover_grid_from_array(img, raster_transform, mesh_size, land_cover_classes, polygon):
+    """
+    Create a land cover grid from an in-memory RGB raster array.
+
+    Same as create_land_cover_grid_from_geotiff_polygon but takes the
+    already-decoded band data, so callers that hold the raster in memory
+    avoid a disk round-trip.
+
+    Args:
+        img (numpy.ndarray): (3, height, width) array of RGB band values
+        raster_transform (Affine): Affine transform mapping pixels to world coordinates
+        mesh_size (float): Size of mesh cells
+        land_cover_classes (dict): Dictionary mapping land cover classes
+        polygon (list): List of polygon vertices
+
+    Returns:
+        numpy.ndarray: Grid of land cover classes within the polygon
+    """
+    src_height, src_width = img.shape[1], img.shape[2]
+    left, bottom, right, top = rasterio.transform.array_bounds(src_height, src_width, raster_transform)
+
+    # Create a Shapely polygon from input coordinates
+    poly = Polygon(polygon)
+
+    # Get bounds of the polygon in WGS84 coordinates
+    left_wgs84, bottom_wgs84, right_wgs84, top_wgs84 = poly.bounds
+    # print(left, bottom, right, top)
+
+    # Calculate width and height using geodesic calculations for accuracy
+    geod = Geod(ellps="WGS84")
+    _, _, width = geod.inv(left_wgs84, bottom_wgs84, right_wgs84, bottom_wgs84)
+    _, _, height = geod.inv(left_wgs84, bottom_wgs84, left_wgs84, top_wgs84)
+
+    # Calculate number of grid cells based on mesh size
+    num_cells_x = int(width / mesh_size + 0.5)
+    num_cells_y = int(height / mesh_size + 0.5)
+
+    # Adjust mesh_size to fit the image exactly
+    adjusted_mesh_size_x = (right - left) / num_cells_x
+    adjusted_mesh_size_y = (top - bottom) / num_cells_y
+
+    # Create affine transform for mapping between pixel and world coordinates
+    new_affine = Affine(adjusted_mesh_size_x, 0, left, 0, -adjusted_mesh_size_y, top)
+
+    # Create coordinate grids for the new mesh
+    cols, rows = np.meshgrid(np.arange(num_cells_x), np.arange(num_cells_y))
+    xs, ys = new_affine * (cols, rows)
+    xs_flat, ys_flat = xs.flatten(), ys.flatten()
+
+    # Convert world coordinates to image pixel indices
+    row, col = rasterio.transform.rowcol(raster_transform, xs_flat, ys_flat)
+    row, col = np.array(row), np.array(col)
+
+    # Filter out indices that fall outside the image bounds
+    valid = (row >= 0) & (row < src_height) & (col >= 0) & (col < src_width)
+    row, col = row[valid], col[valid]
+
+    # Initialize output grid with 'No Data' values
+    grid = np.full((num_cells_y, num_cells_x), 'No Data', dtype=object)
+
+    # Fill grid with dominant land cover classes
+    for i, (r, c) in enumerate(zip(row, col)):
+        cell_data = img[:, r, c]
+        dominant_class = get_dominant_class(cell_data, land_cover_classes)
+        grid_row, grid_col = np.unravel_index(i, (num_cells_y, num_cells_x))
+        grid[grid_row, grid_col] = dominant_class
+
+    # Flip grid vertically to match geographic orientation
+    return np.flipud(grid)
+
 def create_land_cover_grid_from_geotiff_polygon(tiff_path, mesh_size, land_cover_classes, polygon):
     """
     Create a land cover grid from a GeoTIFF file within a polygon boundary.
-    
+
     Args:
         tiff_path (str): Path to GeoTIFF file
         mesh_size (float): Size of mesh cells
         land_cover_classes (dict): Dictionary mapping land cover classes
         polygon (list): List of polygon vertices
-        
+
     Returns:
         numpy.ndarray: Grid of land cover classes within the polygon
     """
     with rasterio.open(tiff_path) as src:
         # Read RGB bands from GeoTIFF
         img = src.read((1,2,3))
-        left, bottom, right, top = src.bounds
-        src_crs = src.crs
-        
-        # Create a Shapely polygon from input coordinates
-        poly = Polygon(polygon)
-        
-        # Get bounds of the polygon in WGS84 coordinates
-        left_wgs84, bottom_wgs84, right_wgs84, top_wgs84 = poly.bounds
-        # print(left, bottom, right, top)
-
-        # Calculate width and height using geodesic calculations for accuracy
-        geod = Geod(ellps="WGS84")
-        _, _, width = geod.inv(left_wgs84, bottom_wgs84, right_wgs84, bottom_wgs84)
-        _, _, height = geod.inv(left_wgs84, bottom_wgs84, left_wgs84, top_wgs84)
-        
-        # Calculate number of grid cells based on mesh size
-        num_cells_x = int(width / mesh_size + 0.5)
-        num_cells_y = int(height / mesh_size + 0.5)
-        
-        # Adjust mesh_size to fit the image exactly
-        adjusted_mesh_size_x = (right - left) / num_cells_x
-        adjusted_mesh_size_y = (top - bottom) / num_cells_y
-        
-        # Create affine transform for mapping between pixel and world coordinates
-        new_affine = Affine(adjusted_mesh_size_x, 0, left, 0, -adjusted_mesh_size_y, top)
-        
-        # Create coordinate grids for the new mesh
-        cols, rows = np.meshgrid(np.arange(num_cells_x), np.arange(num_cells_y))
-        xs, ys = new_affine * (cols, rows)
-        xs_flat, ys_flat = xs.flatten(), ys.flatten()
-        
-        # Convert world coordinates to image pixel indices
-        row, col = src.index(xs_flat, ys_flat)
-        row, col = np.array(row), np.array(col)
-        
-        # Filter out indices that fall outside the image bounds
-        valid = (row >= 0) & (row < src.height) & (col >= 0) & (col < src.width)
-        row, col = row[valid], col[valid]
-        
-        # Initialize output grid with 'No Data' values
-        grid = np.full((num_cells_y, num_cells_x), 'No Data', dtype=object)
-        
-        # Fill grid with dominant land cover classes
-        for i, (r, c) in enumerate(zip(row, col)):
-            cell_data = img[:, r, c]
-            dominant_class = get_dominant_class(cell_data, land_cover_classes)
-            grid_row, grid_col = np.unravel_index(i, (num_cells_y, num_cells_x))
-            grid[grid_row, grid_col] = dominant_class
-    
-    # Flip grid vertically to match geographic orientation
-    return np.flipud(grid)
+        raster_transform = src.transform
+    return create_land_cover_grid_from_array(img, raster_transform, mesh_size, land_cover_classes, polygon)
     
 def create_land_cover_grid_from_geojson_polygon(geojson_data, meshsize, source, rectangle_vertices):
     """Create a grid of land cover classes from GeoJSON polygon data.
@@ -406,68 +425,88 @@ def create_land_cover_grid_from_geojson_polygon(geojson_data, meshsize, source,
                     continue 
     return grid
 
-def create_height_grid_from_geotiff_polygon(tiff_path, mesh_size, polygon):
+def create_height_grid_from_array(img, raster_transform, mesh_size, polygon):
     """
-    Create a height grid from a GeoTIFF file within a polygon boundary.
-    
+    Create a height grid from an in-memory raster array.
+
+    Same as create_height_grid_from_geotiff_polygon but takes the
+    already-decoded band data, so callers that hold the raster in memory
+    avoid a disk round-trip.
+
     Args:
-        tiff_path (str): Path to GeoTIFF file
+        img (numpy.ndarray): (height, width) array of height values
+        raster_transform (Affine): Affine transform mapping pixels to world coordinates
         mesh_size (float): Size of mesh cells
         polygon (list): List of polygon vertices
-        
+
     Returns:
         numpy.ndarray: Grid of heights within the polygon
     """
-    with rasterio.open(tiff_path) as src:
-        # Read height data
-        img = src.read(1)
-        left, bottom, right, top = src.bounds
-        src_crs = src.crs
+    src_height, src_width = img.shape
+    left, bottom, right, top = rasterio.transform.array_bounds(src_height, src_width, raster_transform)
 
-        # Create polygon from input coordinates
-        poly = Polygon(polygon)
-        
-        # Get polygon bounds in WGS84
-        left_wgs84, bottom_wgs84, right_wgs84, top_wgs84 = poly.bounds
-        # print(left, bottom, right, top)
-        # print(left_wgs84, bottom_wgs84, right_wgs84, top_wgs84)
+    # Create polygon from input coordinates
+    poly = Polygon(polygon)
 
-        # Calculate actual distances using geodesic methods
-        geod = Geod(ellps="WGS84")
-        _, _, width = geod.inv(left_wgs84, bottom_wgs84, right_wgs84, bottom_wgs84)
-        _, _, height = geod.inv(left_wgs84, bottom_wgs84, left_wgs84, top_wgs84)
+    # Get polygon bounds in WGS84
+    left_wgs84, bottom_wgs84, right_wgs84, top_wgs84 = poly.bounds
+    # print(left, bottom, right, top)
+    # print(left_wgs84, bottom_wgs84, right_wgs84, top_wgs84)
 
-        # Calculate grid dimensions and adjust mesh size
-        num_cells_x = int(width / mesh_size + 0.5)
-        num_cells_y = int(height / mesh_size + 0.5)
+    # Calculate actual distances using geodesic methods
+    geod = Geod(ellps="WGS84")
+    _, _, width = geod.inv(left_wgs84, bottom_wgs84, right_wgs84, bottom_wgs84)
+    _, _, height = geod.inv(left_wgs84, bottom_wgs84, left_wgs84, top_wgs84)
 
-        adjusted_mesh_size_x = (right - left) / num_cells_x
-        adjusted_mesh_size_y = (top - bottom) / num_cells_y
+    # Calculate grid dimensions and adjust mesh size
+    num_cells_x = int(width / mesh_size + 0.5)
+    num_cells_y = int(height / mesh_size + 0.5)
 
-        # Create affine transform for coordinate mapping
-        new_affine = Affine(adjusted_mesh_size_x, 0, left, 0, -adjusted_mesh_size_y, top)
+    adjusted_mesh_size_x = (right - left) / num_cells_x
+    adjusted_mesh_size_y = (top - bottom) / num_cells_y
 
-        # Generate coordinate grids
-        cols, rows = np.meshgrid(np.arange(num_cells_x), np.arange(num_cells_y))
-        xs, ys = new_affine * (cols, rows)
-        xs_flat, ys_flat = xs.flatten(), ys.flatten()
+    # Create affine transform for coordinate mapping
+    new_affine = Affine(adjusted_mesh_size_x, 0, left, 0, -adjusted_mesh_size_y, top)
 
-        # Convert to image coordinates
-        row, col = src.index(xs_flat, ys_flat)
-        row, col = np.array(row), np.array(col)
+    # Generate coordinate grids
+    cols, rows = np.meshgrid(np.arange(num_cells_x), np.arange(num_cells_y))
+    xs, ys = new_affine * (cols, rows)
+    xs_flat, ys_flat = xs.flatten(), ys.flatten()
 
-        # Filter valid indices
-        valid = (row >= 0) & (row < src.height) & (col >= 0) & (col < src.width)
-        row, col = row[valid], col[valid]
+    # Convert to image coordinates
+    row, col = rasterio.transform.rowcol(raster_transform, xs_flat, ys_flat)
+    row, col = np.array(row), np.array(col)
 
-        # Create output grid and fill with height values
-        grid = np.full((num_cells_y, num_cells_x), np.nan)
-        flat_indices = np.ravel_multi_index((row, col), img.shape)
-        np.put(grid, np.ravel_multi_index((rows.flatten()[valid], cols.flatten()[valid]), grid.shape), img.flat[flat_indices])
+    # Filter valid indices
+    valid = (row >= 0) & (row < src_height) & (col >= 0) & (col < src_width)
+    row, col = row[valid], col[valid]
+
+    # Create output grid and fill with height values
+    grid = np.full((num_cells_y, num_cells_x), np.nan)
+    flat_indices = np.ravel_multi_index((row, col), img.shape)
+    np.put(grid, np.ravel_multi_index((rows.flatten()[valid], cols.flatten()[valid]), grid.shape), img.flat[flat_indices])
 
     return np.flipud(grid)
 
-def create_building_height_grid_from_geojson_polygon(geojson_data, meshsize, rectangle_vertices, geojson_data_comp=None, geotiff_path_comp=None, complement_building_footprints=None):
+def create_height_grid_from_geotiff_polygon(tiff_path, mesh_size, polygon):
+    """
+    Create a height grid from a GeoTIFF file within a polygon boundary.
+
+    Args:
+        tiff_path (str): Path to GeoTIFF file
+        mesh_size (float): Size of mesh cells
+        polygon (list): List of polygon vertices
+
+    Returns:
+        numpy.ndarray: Grid of heights within the polygon
+    """
+    with rasterio.open(tiff_path) as src:
+        # Read height data
+        img = src.read(1)
+        raster_transform = src.transform
+    return create_height_grid_from_array(img, raster_transform, mesh_size, polygon)
+
+def create_building_height_grid_from_geojson_polygon(geojson_data, meshsize, rectangle_vertices, geojson_data_comp=None, geotiff_path_comp=None, complement_building_footprints=None, rasterize_method="exact"):
     """
     Create a building height grid from GeoJSON data within a polygon boundary.
     
@@ -478,7 +517,10 @@ def create_building_height_grid_from_geojson_polygon(geojson_data, meshsize, rec
         geojson_data_comp (dict, optional): Complementary GeoJSON data
         geotiff_path_comp (str, optional): Path to complementary GeoTIFF file
         complement_building_footprints (bool, optional): Whether to complement building footprints
-        
+        rasterize_method (str): "exact" for the per-cell intersection-area test,
+            "scanline" for the compiled cell-center scanline fill (faster,
+            approximate on boundary cells)
+
     Returns:
         tuple: (building_height_grid, building_min_height_grid, building_id_grid, filtered_buildings)
             - building_height_grid (numpy.ndarray): Grid of building heights
@@ -537,6 +579,13 @@ def create_building_height_grid_from_geojson_polygon(geojson_data, meshsize, rec
     # Create building polygons and spatial index
     building_polygons, idx = create_building_polygons(filtered_buildings_comp)
 
+    # Optional compiled scanline fill: one pass per footprint instead of one
+    # polygon intersection per cell
+    if rasterize_method == "scanline":
+        building_height_grid, building_min_height_grid, building_id_grid = rasterize_buildings_scanline(
+            building_polygons, grid_size, origin, adjusted_meshsize, u_vec, v_vec)
+        return building_height_grid, building_min_height_grid, building_id_grid, filtered_buildings
+
     # Process each grid cell
     for i in range(grid_size[0]):
         for j in range(grid_size[1]):
@@ -679,16 +728,22 @@ def create_building_height_grid_from_open_building_temporal_polygon(meshsize, re
 
     return building_height_grid, building_min_height_grid, building_id_grid, filtered_buildings
 
-def create_dem_grid_from_geotiff_polygon(tiff_path, mesh_size, rectangle_vertices, dem_interpolation=False):
+def create_dem_grid_from_array(dem, raster_transform, src_crs, mesh_size, rectangle_vertices, dem_interpolation=False):
     """
-    Create a Digital Elevation Model (DEM) grid from a GeoTIFF file within a polygon boundary.
-    
+    Create a Digital Elevation Model (DEM) grid from an in-memory raster array.
+
+    Same as create_dem_grid_from_geotiff_polygon but takes the
+    already-decoded band data, so callers that hold the raster in memory
+    avoid a disk round-trip.
+
     Args:
-        tiff_path (str): Path to GeoTIFF file
+        dem (numpy.ndarray): (height, width) array of elevation values
+        raster_transform (Affine): Affine transform mapping pixels to world coordinates
+        src_crs: Coordinate reference system of the raster
         mesh_size (float): Size of mesh cells
         rectangle_vertices (list): List of rectangle vertices defining the boundary
         dem_interpolation (bool): Whether to use cubic interpolation for smoother results
-        
+
     Returns:
         numpy.ndarray: Grid of elevation values
     """
@@ -696,60 +751,100 @@ def create_dem_grid_from_geotiff_polygon(tiff_path, mesh_size, rectangle_vertice
     converted_coords = convert_format_lat_lon(rectangle_vertices)
     roi_shapely = Polygon(converted_coords)
 
+    # Handle no-data values
+    dem = np.where(dem < -1000, 0, dem)  # Replace extreme negative values with 0
+
+    # Handle coordinate system conversion
+    if src_crs.to_epsg() != 3857:
+        transformer_to_3857 = Transformer.from_crs(src_crs, CRS.from_epsg(3857), always_xy=True)
+    else:
+        transformer_to_3857 = lambda x, y: (x, y)
+
+    # Transform ROI bounds to EPSG:3857 (Web Mercator)
+    roi_bounds = roi_shapely.bounds
+    roi_left, roi_bottom = transformer_to_3857.transform(roi_bounds[0], roi_bounds[1])
+    roi_right, roi_top = transformer_to_3857.transform(roi_bounds[2], roi_bounds[3])
+
+    # Convert to WGS84 for accurate distance calculations
+    wgs84 = CRS.from_epsg(4326)
+    transformer_to_wgs84 = Transformer.from_crs(CRS.from_epsg(3857), wgs84, always_xy=True)
+    roi_left_wgs84, roi_bottom_wgs84 = transformer_to_wgs84.transform(roi_left, roi_bottom)
+    roi_right_wgs84, roi_top_wgs84 = transformer_to_wgs84.transform(roi_right, roi_top)
+
+    # Calculate actual distances using geodesic methods
+    geod = Geod(ellps="WGS84")
+    _, _, roi_width_m = geod.inv(roi_left_wgs84, roi_bottom_wgs84, roi_right_wgs84, roi_bottom_wgs84)
+    _, _, roi_height_m = geod.inv(roi_left_wgs84, roi_bottom_wgs84, roi_left_wgs84, roi_top_wgs84)
+
+    # Calculate grid dimensions
+    num_cells_x = int(roi_width_m / mesh_size + 0.5)
+    num_cells_y = int(roi_height_m / mesh_size + 0.5)
+
+    # Create coordinate grid in EPSG:3857
+    x = np.linspace(roi_left, roi_right, num_cells_x, endpoint=False)
+    y = np.linspace(roi_top, roi_bottom, num_cells_y, endpoint=False)
+    xx, yy = np.meshgrid(x, y)
+
+    # Transform original DEM coordinates to EPSG:3857
+    rows, cols = np.meshgrid(range(dem.shape[0]), range(dem.shape[1]), indexing='ij')
+    orig_x, orig_y = rasterio.transform.xy(raster_transform, rows.ravel(), cols.ravel())
+    orig_x, orig_y = transformer_to_3857.transform(orig_x, orig_y)
+
+    # Interpolate DEM values onto new grid
+    points = np.column_stack((orig_x, orig_y))
+    values = dem.ravel()
+    if dem_interpolation:
+        # Use cubic interpolation for smoother results
+        grid = griddata(points, values, (xx, yy), method='cubic')
+    else:
+        # Use nearest neighbor interpolation for raw data
+        grid = griddata(points, values, (xx, yy), method='nearest')
+
+    return np.flipud(grid)
+
+def create_dem_grid_from_geotiff_polygon(tiff_path, mesh_size, rectangle_vertices, dem_interpolation=False):
+    """
+    Create a Digital Elevation Model (DEM) grid from a GeoTIFF file within a polygon boundary.
+
+    Args:
+        tiff_path (str): Path to GeoTIFF file
+        mesh_size (float): Size of mesh cells
+        rectangle_vertices (list): List of rectangle vertices defining the boundary
+        dem_interpolation (bool): Whether to use cubic interpolation for smoother results
+
+    Returns:
+        numpy.ndarray: Grid of elevation values
+    """
     with rasterio.open(tiff_path) as src:
-        # Read DEM data and handle no-data values
+        # Read DEM data
         dem = src.read(1)
-        dem = np.where(dem < -1000, 0, dem)  # Replace extreme negative values with 0
-        transform = src.transform
+        raster_transform = src.transform
         src_crs = src.crs
+    return create_dem_grid_from_array(dem, raster_transform, src_crs, mesh_size, rectangle_vertices, dem_interpolation=dem_interpolation)
 
-        # Handle coordinate system conversion
-        if src_crs.to_epsg() != 3857:
-            transformer_to_3857 = Transformer.from_crs(src_crs, CRS.from_epsg(3857), always_xy=True)
-        else:
-            transformer_to_3857 = lambda x, y: (x, y)
-
-        # Transform ROI bounds to EPSG:3857 (Web Mercator)
-        roi_bounds = roi_shapely.bounds
-        roi_left, roi_bottom = transformer_to_3857.transform(roi_bounds[0], roi_bounds[1])
-        roi_right, roi_top = transformer_to_3857.transform(roi_bounds[2], roi_bounds[3])
-
-        # Convert to WGS84 for accurate distance calculations
-        wgs84 = CRS.from_epsg(4326)
-        transformer_to_wgs84 = Transformer.from_crs(CRS.from_epsg(3857), wgs84, always_xy=True)
-        roi_left_wgs84, roi_bottom_wgs84 = transformer_to_wgs84.transform(roi_left, roi_bottom)
-        roi_right_wgs84, roi_top_wgs84 = transformer_to_wgs84.transform(roi_right, roi_top)
-
-        # Calculate actual distances using geodesic methods
-        geod = Geod(ellps="WGS84")
-        _, _, roi_width_m = geod.inv(roi_left_wgs84, roi_bottom_wgs84, roi_right_wgs84, roi_bottom_wgs84)
-        _, _, roi_height_m = geod.inv(roi_left_wgs84, roi_bottom_wgs84, roi_left_wgs84, roi_top_wgs84)
-
-        # Calculate grid dimensions
-        num_cells_x = int(roi_width_m / mesh_size + 0.5)
-        num_cells_y = int(roi_height_m / mesh_size + 0.5)
-
-        # Create coordinate grid in EPSG:3857
-        x = np.linspace(roi_left, roi_right, num_cells_x, endpoint=False)
-        y = np.linspace(roi_top, roi_bottom, num_cells_y, endpoint=False)
-        xx, yy = np.meshgrid(x, y)
-
-        # Transform original DEM coordinates to EPSG:3857
-        rows, cols = np.meshgrid(range(dem.shape[0]), range(dem.shape[1]), indexing='ij')
-        orig_x, orig_y = rasterio.transform.xy(transform, rows.ravel(), cols.ravel())
-        orig_x, orig_y = transformer_to_3857.transform(orig_x, orig_y)
-
-        # Interpolate DEM values onto new grid
-        points = np.column_stack((orig_x, orig_y))
-        values = dem.ravel()
-        if dem_interpolation:
-            # Use cubic interpolation for smoother results
-            grid = griddata(points, values, (xx, yy), method='cubic')
-        else:
-            # Use nearest neighbor interpolation for raw data
-            grid = griddata(points, values, (xx, yy), method='nearest')
+@njit(parallel=True, cache=True)
+def _fill_cell_vertices(rows, cols, min_lon, max_lat, cell_size_lon, cell_size_lat, out):
+    """Fill an (rows*cols, 4, 2) array with grid cell corner coordinates.
 
-    return np.flipud(grid)
+    Cells are ordered row-major with the vertical axis flipped (origin at
+    top-left), matching the iteration order grid_to_geodataframe uses for
+    the value column.
+    """
+    for idx in prange(rows * cols):
+        i = idx // cols
+        j = idx % cols
+        cell_min_lon = min_lon + j * cell_size_lon
+        cell_max_lon = min_lon + (j + 1) * cell_size_lon
+        cell_min_lat = max_lat - (i + 1) * cell_size_lat
+        cell_max_lat = max_lat - i * cell_size_lat
+        out[idx, 0, 0] = cell_min_lon
+        out[idx, 0, 1] = cell_min_lat
+        out[idx, 1, 0] = cell_max_lon
+        out[idx, 1, 1] = cell_min_lat
+        out[idx, 2, 0] = cell_max_lon
+        out[idx, 2, 1] = cell_max_lat
+        out[idx, 3, 0] = cell_min_lon
+        out[idx, 3, 1] = cell_max_lat
 
 def grid_to_geodataframe(grid_ori, rectangle_vertices, meshsize):
     """Converts a 2D grid to a GeoDataFrame with cell polygons and values.
@@ -764,8 +859,9 @@ def grid_to_geodataframe(grid_ori, rectangle_vertices, meshsize):
             - geometry: Polygon geometry of each grid cell
             - value: Value from the grid
     """
-    grid = np.flipud(grid_ori.copy())
-    
+    # flipud returns a view and the grid is only read below
+    grid = np.flipud(grid_ori)
+
     # Extract bounds from rectangle vertices
     min_lon = min(v[0] for v in rectangle_vertices)
     max_lon = max(v[0] for v in rectangle_vertices)
@@ -779,30 +875,16 @@ def grid_to_geodataframe(grid_ori, rectangle_vertices, meshsize):
     cell_size_lon = meshsize / (111111 * np.cos(np.mean([min_lat, max_lat]) * np.pi / 180))
     cell_size_lat = meshsize / 111111
     
-    # Create lists to store data
-    polygons = []
-    values = []
-    
-    # Create grid cells
-    for i in range(rows):
-        for j in range(cols):
-            # Calculate cell bounds
-            cell_min_lon = min_lon + j * cell_size_lon
-            cell_max_lon = min_lon + (j + 1) * cell_size_lon
-            # Flip vertical axis since grid is stored with origin at top-left
-            cell_min_lat = max_lat - (i + 1) * cell_size_lat
-            cell_max_lat = max_lat - i * cell_size_lat
-            
-            # Create polygon for cell
-            cell_poly = box(cell_min_lon, cell_min_lat, cell_max_lon, cell_max_lat)
-            
-            polygons.append(cell_poly)
-            values.append(grid[i, j])
+    # Fill all cell corners with a parallel kernel, then build every polygon
+    # in one vectorized Shapely call instead of a Python loop of box()
+    verts = np.empty((rows * cols, 4, 2), dtype=np.float64)
+    _fill_cell_vertices(rows, cols, min_lon, max_lat, cell_size_lon, cell_size_lat, verts)
+    polygons = shapely.polygons(verts)
     
     # Create GeoDataFrame
     gdf = gpd.GeoDataFrame({
         'geometry': polygons,
-        'value': values
+        'value': grid.ravel()
     }, crs=CRS.from_epsg(4326))
     
     return gdf
\ No newline at end of file
@@ -142,7 +142,7 @@ def get_network_values(
 
     # Save
     if settings['save_path']:
-        edge_gdf.to_file(settings['save_path'], driver="GPKG")
+        edge_gdf.to_file(settings['save_path'], driver="GPKG", engine="pyogrio")
 
     if settings['vis_graph']:
         edge_gdf_web = edge_gdf.to_crs(epsg=3857)
@@ -480,7 +480,7 @@ def analyze_network_slopes(
             settings['output_directory'],
             f"{settings['output_file_name']}.gpkg"
         )
-        edge_gdf.to_file(out_path, driver="GPKG")
+        edge_gdf.to_file(out_path, driver="GPKG", engine="pyogrio")
 
     # 10) Visualization
     if settings['vis_graph']:
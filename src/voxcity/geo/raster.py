@@ -0,0 +1,184 @@
+"""
+This module provides compiled scanline rasterization of building footprints.
+
+It offers a fast alternative to the cell-by-cell polygon intersection loop in
+create_building_height_grid_from_geojson_polygon: footprints are transformed
+into fractional grid indices once and filled with an even-odd scanline pass
+per building, so the per-cell cost is independent of how many buildings the
+tile contains. Cells are assigned by whether their center falls inside the
+footprint, which approximates the exact path's 30% intersection-area rule.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _covered_cells(gi, gj, rows, cols, out_i, out_j):
+    """Collect indices of cells whose centers lie inside a polygon ring.
+
+    The ring is given in fractional grid coordinates (gi along rows, gj
+    along columns) with the first vertex repeated at the end. Scanlines run
+    through the cell centers at gi = i + 0.5; crossings are paired even-odd
+    so holes punched by self-touching rings behave like the standard fill
+    rule.
+
+    Args:
+        gi: 1D array of ring vertex coordinates along the row axis
+        gj: 1D array of ring vertex coordinates along the column axis
+        rows: Number of grid rows
+        cols: Number of grid columns
+        out_i: Preallocated output buffer for covered row indices
+        out_j: Preallocated output buffer for covered column indices
+
+    Returns:
+        int: Number of covered cells written to the output buffers
+    """
+    n = gi.size
+    gi_min = gi[0]
+    gi_max = gi[0]
+    for t in range(1, n):
+        if gi[t] < gi_min:
+            gi_min = gi[t]
+        if gi[t] > gi_max:
+            gi_max = gi[t]
+
+    # Rows whose center line can cross the ring
+    i_start = int(np.floor(gi_min + 0.5))
+    i_end = int(np.floor(gi_max - 0.5)) + 1
+    if i_start < 0:
+        i_start = 0
+    if i_end > rows:
+        i_end = rows
+
+    xs = np.empty(n, dtype=np.float64)
+    count = 0
+    for i in range(i_start, i_end):
+        y = i + 0.5
+
+        # Gather the column coordinates where the scanline crosses an edge;
+        # the half-open test keeps vertices from being counted twice
+        m = 0
+        for e in range(n - 1):
+            y0 = gi[e]
+            y1 = gi[e + 1]
+            if (y0 <= y < y1) or (y1 <= y < y0):
+                xs[m] = gj[e] + (y - y0) * (gj[e + 1] - gj[e]) / (y1 - y0)
+                m += 1
+
+        # Insertion sort; crossing counts per row are tiny
+        for a in range(1, m):
+            key = xs[a]
+            b = a - 1
+            while b >= 0 and xs[b] > key:
+                xs[b + 1] = xs[b]
+                b -= 1
+            xs[b + 1] = key
+
+        # Fill the cells whose centers fall between crossing pairs
+        for s in range(0, m - 1, 2):
+            j_lo = int(np.floor(xs[s] - 0.5)) + 1
+            j_hi = int(np.ceil(xs[s + 1] - 0.5)) - 1
+            if j_lo < 0:
+                j_lo = 0
+            if j_hi >= cols:
+                j_hi = cols - 1
+            for j in range(j_lo, j_hi + 1):
+                out_i[count] = i
+                out_j[count] = j
+                count += 1
+    return count
+
+
+def rasterize_buildings_scanline(building_polygons, grid_size, origin, adjusted_meshsize, u_vec, v_vec):
+    """Rasterize building polygons onto the mesh grid with scanline fills.
+
+    Produces the same three grids as the exact per-cell intersection loop in
+    create_building_height_grid_from_geojson_polygon. Buildings are processed
+    in descending height order so overlap resolution (maximum valid height
+    wins, inner courtyards close a cell against lower buildings) matches the
+    per-cell sort of the exact path; coverage is decided by the cell center
+    instead of the 30% intersection-area threshold.
+
+    Args:
+        building_polygons (list): (polygon, height, min_height, is_inner, feature_id) tuples
+        grid_size (tuple): Grid dimensions (rows, cols)
+        origin (numpy.ndarray): Origin point coordinates
+        adjusted_meshsize (tuple): Adjusted mesh size in each dimension
+        u_vec (numpy.ndarray): Unit vector in first direction
+        v_vec (numpy.ndarray): Unit vector in second direction
+
+    Returns:
+        tuple: (building_height_grid, building_min_height_grid, building_id_grid)
+    """
+    rows, cols = grid_size
+    building_height_grid = np.zeros(grid_size)
+    building_id_grid = np.zeros(grid_size)
+    building_min_height_grid = np.empty(grid_size, dtype=object)
+    for i in range(rows):
+        for j in range(cols):
+            building_min_height_grid[i, j] = []
+
+    # Cells span origin + [i, i+1]*m0*u_vec + [j, j+1]*m1*v_vec, so inverting
+    # the basis maps lon/lat vertices to fractional grid indices
+    basis = np.column_stack((adjusted_meshsize[0] * u_vec, adjusted_meshsize[1] * v_vec))
+    inv_basis = np.linalg.inv(basis)
+
+    def sort_height(entry):
+        height = entry[1]
+        if height is None or np.isnan(height):
+            return -np.inf
+        return height
+
+    # Bookkeeping mirroring the exact loop: found/has_valid drive the NaN
+    # assignment for covered cells without any valid height, closed marks
+    # cells taken over by an inner courtyard
+    found = np.zeros(grid_size, dtype=bool)
+    has_valid = np.zeros(grid_size, dtype=bool)
+    closed = np.zeros(grid_size, dtype=bool)
+    out_i = np.empty(rows * cols, dtype=np.int64)
+    out_j = np.empty(rows * cols, dtype=np.int64)
+
+    for polygon, height, min_height, is_inner, feature_id in sorted(building_polygons, key=sort_height, reverse=True):
+        if not polygon.is_valid:
+            polygon = polygon.buffer(0)
+        parts = polygon.geoms if polygon.geom_type == 'MultiPolygon' else (polygon,)
+
+        for part in parts:
+            coords = np.asarray(part.exterior.coords, dtype=np.float64)
+            grid_coords = (coords - origin) @ inv_basis.T
+            count = _covered_cells(np.ascontiguousarray(grid_coords[:, 0]),
+                                   np.ascontiguousarray(grid_coords[:, 1]),
+                                   rows, cols, out_i, out_j)
+            if count == 0:
+                continue
+            ii = out_i[:count]
+            jj = out_j[:count]
+            still_open = ~closed[ii, jj]
+            ii = ii[still_open]
+            jj = jj[still_open]
+            if ii.size == 0:
+                continue
+
+            if is_inner:
+                # Inner courtyards clear the cell and shut out lower buildings
+                for a, b in zip(ii, jj):
+                    building_min_height_grid[a, b] = [[0, 0]]
+                building_height_grid[ii, jj] = 0
+                found[ii, jj] = True
+                has_valid[ii, jj] = True
+                closed[ii, jj] = True
+            else:
+                for a, b in zip(ii, jj):
+                    building_min_height_grid[a, b].append([min_height, height])
+                building_id_grid[ii, jj] = feature_id
+                found[ii, jj] = True
+                if height is not None and not np.isnan(height) and height > 0:
+                    has_valid[ii, jj] = True
+                    current = building_height_grid[ii, jj]
+                    update = (current == 0) | (current < height) | np.isnan(current)
+                    building_height_grid[ii[update], jj[update]] = height
+
+    # Covered cells where every intersecting building had zero/NaN height
+    building_height_grid[found & ~has_valid] = np.nan
+    return building_height_grid, building_min_height_grid, building_id_grid
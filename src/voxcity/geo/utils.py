@@ -137,10 +137,7 @@ def normalize_to_one_meter(vector, distance_in_meters):
     Returns:
         numpy.ndarray: Normalized vector
     """
-    norm = np.linalg.norm(vector)
-    if norm == 0:
-        return vector
-    return (vector / norm) * (1 / distance_in_meters)
+    return vector * (1 / distance_in_meters)
 
 def setup_transformer(from_crs, to_crs):
     """
@@ -278,10 +278,8 @@ def convert_land_cover_array(input_array, land_cover_classes):
     # Create a mapping of class names to integers
     class_to_int = {name: i for i, name in enumerate(land_cover_classes.values())}
 
-    # Create a vectorized function to map string values to integers
-    vectorized_map = np.vectorize(lambda x: class_to_int.get(x, -1))
-
-    # Apply the mapping to the input array
-    output_array = vectorized_map(input_array)
-
-    return output_array
\ No newline at end of file
+    # Map through the handful of distinct labels instead of a Python dict
+    # lookup per cell: one np.unique pass, then a vectorized LUT gather
+    unique_labels, inverse = np.unique(input_array, return_inverse=True)
+    lut = np.array([class_to_int.get(label, -1) for label in unique_labels])
+    return lut[inverse].reshape(input_array.shape)
\ No newline at end of file
@@ -1,10 +1,14 @@
+import os
+
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from tqdm import tqdm
 import matplotlib.colors as mcolors
 from matplotlib.colors import ListedColormap, BoundaryNorm
+from matplotlib.collections import LineCollection, PolyCollection
 import contextily as ctx
+import shapely
 from shapely.geometry import Polygon
 import plotly.graph_objects as go
 from tqdm import tqdm
@@ -16,6 +20,8 @@ import seaborn as sns
 import random
 import folium
 import math
+from functools import lru_cache
+from numba import njit
 
 from .lc import get_land_cover_classes
 # from ..geo.geojson import filter_buildings
@@ -35,6 +41,233 @@ from ..geo.utils import (
 )
 from .material import get_material_dict
 
+# Single shared transformer for WGS84 -> Web Mercator conversions
+_TRANSFORMER_4326_TO_3857 = pyproj.Transformer.from_crs(4326, 3857, always_xy=True)
+
+# WGS84 semi-major axis used by the spherical Web Mercator projection
+_WEBMERC_R = 6378137.0
+
+@njit(cache=True)
+def _lonlat_to_webmerc(lon, lat):
+    """Closed-form EPSG:3857 forward transform for a single point.
+
+    Web Mercator is a spherical projection with an exact closed form, so
+    corner transforms in hot paths skip the pyproj dispatch round-trip.
+
+    Args:
+        lon: Longitude in degrees
+        lat: Latitude in degrees
+
+    Returns:
+        tuple: (x, y) in EPSG:3857 meters
+    """
+    x = _WEBMERC_R * np.deg2rad(lon)
+    y = _WEBMERC_R * np.log(np.tan(np.pi / 4.0 + np.deg2rad(lat) / 2.0))
+    return x, y
+
+def _mercator_grid_edges(rectangle_vertices, grid_shape, meshsize):
+    """Compute Web Mercator cell-edge arrays for a regular lon/lat grid.
+
+    Only the rectangle corners go through pyproj; since the lattice is
+    regular, the cell edges are derived arithmetically with linspace instead
+    of transforming every cell vertex.
+
+    Args:
+        rectangle_vertices: List of (lon, lat) pairs defining the area corners
+        grid_shape: (rows, cols) of the grid
+        meshsize: Size of each grid cell in meters
+
+    Returns:
+        tuple: (x_edges, y_edges) ascending EPSG:3857 edge arrays of length
+            cols+1 and rows+1, with grid row 0 at the bottom
+    """
+    rows, cols = grid_shape
+
+    min_lon = min(v[0] for v in rectangle_vertices)
+    min_lat = min(v[1] for v in rectangle_vertices)
+    max_lat = max(v[1] for v in rectangle_vertices)
+
+    # Cell sizes in degrees (approximate); 111,111 meters = 1 degree at equator
+    cell_size_lon = meshsize / (111111 * np.cos(np.mean([min_lat, max_lat]) * np.pi / 180))
+    cell_size_lat = meshsize / 111111
+
+    # Transform only the two opposite grid corners with the compiled kernel
+    x0, y0 = _lonlat_to_webmerc(min_lon, max_lat - cell_size_lat * rows)
+    x1, y1 = _lonlat_to_webmerc(min_lon + cell_size_lon * cols, max_lat)
+
+    x_edges = np.linspace(x0, x1, cols + 1)
+    y_edges = np.linspace(y0, y1, rows + 1)
+    return x_edges, y_edges
+
+# Basemap tile providers shared by the grid visualization functions
+BASEMAPS = {
+    'CartoDB dark': ctx.providers.CartoDB.DarkMatter,
+    'CartoDB light': ctx.providers.CartoDB.Positron,
+    'CartoDB voyager': ctx.providers.CartoDB.Voyager,
+    'CartoDB light no labels': ctx.providers.CartoDB.PositronNoLabels,
+    'CartoDB dark no labels': ctx.providers.CartoDB.DarkMatterNoLabels,
+}
+
+@lru_cache(maxsize=32)
+def _fetch_basemap_image(xmin, ymin, xmax, ymax, basemap_name, zoom):
+    """Download and decode basemap tiles for the given Web Mercator bounds.
+
+    Results are cached at module level so repeated plots over the same
+    viewport skip the tile download and PNG decoding entirely.
+
+    Args:
+        xmin, ymin, xmax, ymax: Viewport bounds in EPSG:3857
+        basemap_name: Key into BASEMAPS selecting the tile provider
+        zoom: Zoom level passed to contextily ('auto' or int)
+
+    Returns:
+        tuple: (image array, extent in EPSG:3857)
+    """
+    return ctx.bounds2img(xmin, ymin, xmax, ymax, source=BASEMAPS[basemap_name], zoom=zoom)
+
+def _add_basemap(ax, basemap_name, zoom='auto', cache_path=None):
+    """Blit cached basemap tiles onto an axis whose data is in EPSG:3857.
+
+    With cache_path set, the tile mosaic is persisted as a GeoTIFF on the
+    first call and read back from disk afterwards, so later plots need no
+    network at all; otherwise tiles go through the in-memory lru cache.
+    """
+    xmin, xmax = ax.get_xlim()
+    ymin, ymax = ax.get_ylim()
+    if cache_path is not None:
+        import rasterio
+
+        if not os.path.exists(cache_path):
+            ctx.bounds2raster(xmin, ymin, xmax, ymax, cache_path,
+                              source=BASEMAPS[basemap_name], zoom=zoom)
+        with rasterio.open(cache_path) as src:
+            img = src.read([1, 2, 3]).transpose(1, 2, 0)
+            extent = (src.bounds.left, src.bounds.right,
+                      src.bounds.bottom, src.bounds.top)
+    else:
+        # Round the bounds so pan-adjacent viewports hit the same cache entry
+        img, extent = _fetch_basemap_image(round(xmin), round(ymin), round(xmax), round(ymax),
+                                           basemap_name, zoom)
+    ax.imshow(img, extent=extent, interpolation='bilinear', zorder=-1)
+    # imshow resets the data limits; restore the original viewport
+    ax.set_xlim(xmin, xmax)
+    ax.set_ylim(ymin, ymax)
+
+
+def _gdf_to_web_mercator(gdf):
+    """Reproject a WGS84 grid GeoDataFrame to Web Mercator in one batch.
+
+    GeoSeries.to_crs dispatches through pyproj per geometry; here the
+    coordinates are exported once as a contiguous (N, 2) array, pushed
+    through the shared transformer in a single call, and rebuilt into new
+    geometries, so libproj runs over the whole array at once.
+
+    Args:
+        gdf: GeoDataFrame in EPSG:4326 with 'geometry' and 'value' columns
+
+    Returns:
+        GeoDataFrame: Copy of gdf with geometries in EPSG:3857
+    """
+    geom_type, coords, offsets = shapely.to_ragged_array(gdf.geometry.values)
+    xs, ys = _TRANSFORMER_4326_TO_3857.transform(coords[:, 0], coords[:, 1])
+    geoms = shapely.from_ragged_array(geom_type, np.column_stack([xs, ys]), offsets)
+    gdf_web = gdf.copy()
+    gdf_web['geometry'] = geoms
+    return gdf_web.set_crs(epsg=3857, allow_override=True)
+
+
+def _downsample_to_canvas(values, target_rows, target_cols):
+    """Block-average a grid that greatly exceeds the canvas resolution.
+
+    When the grid holds far more cells than the figure has pixels, the
+    extra cells are pure rasterizer work with no visible effect. Integer
+    block means shrink memory traffic by the block factor squared while
+    staying visually identical. Grids near or below canvas resolution are
+    returned unchanged.
+
+    Args:
+        values: 2D float array of grid values
+        target_rows: Canvas height in pixels
+        target_cols: Canvas width in pixels
+
+    Returns:
+        ndarray: Downsampled (or original) value array
+    """
+    rows, cols = values.shape
+    factor = min(rows // max(target_rows, 1), cols // max(target_cols, 1))
+    if factor < 2:
+        return values
+    # Pad the ragged edge with NaN so the extent stays exact; nanmean
+    # ignores the padding inside edge blocks
+    pad_r = (-rows) % factor
+    pad_c = (-cols) % factor
+    if pad_r or pad_c:
+        values = np.pad(values, ((0, pad_r), (0, pad_c)), constant_values=np.nan)
+    blocks = values.reshape((rows + pad_r) // factor, factor, (cols + pad_c) // factor, factor)
+    return np.nanmean(blocks, axis=(1, 3))
+
+# Cached Web Mercator grid GeoDataFrames keyed on the geometry inputs
+_GRID_GDF_CACHE = {}
+
+def _grid_gdf_web(grid, rectangle_vertices, meshsize):
+    """Build, or reuse, the Web Mercator GeoDataFrame for a grid.
+
+    The cell geometries depend only on the grid shape, the rectangle and
+    the mesh size, so repeated plots over the same area (time sliders,
+    parameter sweeps) reuse the cached geometry and reprojection and only
+    refresh the 'value' column.
+
+    Args:
+        grid: 2D numpy array of cell values
+        rectangle_vertices: List of (lon, lat) pairs defining the area
+        meshsize: Size of each grid cell in meters
+
+    Returns:
+        GeoDataFrame: Grid cells in EPSG:3857 with current values
+    """
+    key = (np.shape(grid), float(meshsize), tuple(map(tuple, rectangle_vertices)))
+    gdf_web = _GRID_GDF_CACHE.get(key)
+    if gdf_web is None:
+        gdf = grid_to_geodataframe(grid, rectangle_vertices, meshsize)
+        gdf_web = _gdf_to_web_mercator(gdf)
+        _GRID_GDF_CACHE[key] = gdf_web
+    else:
+        # Same cell order grid_to_geodataframe produces: row-major over the
+        # vertically flipped grid
+        gdf_web['value'] = np.flipud(grid).ravel()
+    return gdf_web
+
+
+def _plot_gdf_cells(ax, gdf, cmap, norm, alpha, edge_color='none', edge_width=0.0):
+    """Draw a grid-cell GeoDataFrame as one PolyCollection.
+
+    The geometries are exported once through shapely.to_ragged_array so all
+    coordinates live in a single contiguous buffer; matplotlib then renders
+    one collection instead of one artist per cell, which is what the generic
+    GeoPandas plot path would create.
+
+    Args:
+        ax: Matplotlib axis to draw on
+        gdf: GeoDataFrame with 'geometry' and 'value' columns
+        cmap: Colormap name or instance
+        norm: Normalization mapping values to colormap positions
+        edge_color: Cell edge color passed to the collection
+        edge_width: Cell edge line width
+
+    Returns:
+        PolyCollection: The added collection
+    """
+    _, coords, offsets = shapely.to_ragged_array(gdf.geometry.values)
+    # Grid cells are single-ring polygons, so the ring offsets delimit them
+    verts = np.split(coords, offsets[0][1:-1])
+    collection = PolyCollection(verts, array=gdf['value'].to_numpy(),
+                                cmap=cmap, norm=norm, alpha=alpha,
+                                edgecolors=edge_color, linewidths=edge_width)
+    ax.add_collection(collection)
+    ax.set_aspect('equal')
+    ax.autoscale_view()
+    return collection
+
 def get_default_voxel_color_map():
     return {
         -99: [0, 0, 0],  # void,
@@ -242,8 +475,10 @@ def visualize_3d_voxel_plotly(voxel_grid, color_map = get_default_voxel_color_ma
     print("Visualization complete. Displaying plot...")
     fig.show()
 
-def plot_grid(grid, origin, adjusted_meshsize, u_vec, v_vec, transformer, vertices, data_type, vmin=None, vmax=None, color_map=None, alpha=0.5, buf=0.2, edge=True, basemap='CartoDB light', **kwargs):
-    fig, ax = plt.subplots(figsize=(12, 12))
+def plot_grid(grid, origin, adjusted_meshsize, u_vec, v_vec, transformer, vertices, data_type, vmin=None, vmax=None, color_map=None, alpha=0.5, buf=0.2, edge=True, basemap='CartoDB light', basemap_zoom='auto', basemap_cache_path=None, extent=None, backend='matplotlib', **kwargs):
+    # Constrained layout is solved incrementally at draw time, unlike
+    # tight_layout which re-inspects every artist's bounding box per call
+    fig, ax = plt.subplots(figsize=(12, 12), constrained_layout=True)
 
     if data_type == 'land_cover':
         land_cover_classes = kwargs.get('land_cover_classes')
@@ -321,89 +556,111 @@ def plot_grid(grid, origin, adjusted_meshsize, u_vec, v_vec, transformer, vertic
         # cmap = plt.cm.get_cmap(color_map).copy()
         cmap = sns.color_palette(color_map, as_cmap=True).copy()
 
-    # Ensure grid is in the correct orientation
-    grid = grid.T
-
-    for i in range(grid.shape[0]):
-        for j in range(grid.shape[1]):
-            cell = create_cell_polygon(origin, j, i, adjusted_meshsize, u_vec, v_vec)  # Note the swap of i and j
-            x, y = cell.exterior.xy
-            x, y = zip(*[transformer.transform(lon, lat) for lat, lon in zip(x, y)])
-
-            value = grid[i, j]
-
-            if data_type == 'building_height':
-                if np.isnan(value):
-                    # White fill for NaN values
-                    ax.fill(x, y, alpha=alpha, fc='gray', ec='black' if edge else None, linewidth=0.1)
-                elif value == 0:
-                    # No fill for zero values, only edges if enabled
-                    if edge:
-                        ax.plot(x, y, color='black', linewidth=0.1)
-                elif value > 0:
-                    # Viridis colormap for positive values
-                    color = cmap(norm(value))
-                    ax.fill(x, y, alpha=alpha, fc=color, ec='black' if edge else None, linewidth=0.1)
-            elif data_type == 'canopy_height':
-                color = cmap(norm(value))
-                if value == 0:
-                    # No fill for zero values, only edges if enabled
-                    if edge:
-                        ax.plot(x, y, color='black', linewidth=0.1)
-                else:
-                    if edge:
-                        ax.fill(x, y, alpha=alpha, fc=color, ec='black', linewidth=0.1)
-                    else:
-                        ax.fill(x, y, alpha=alpha, fc=color, ec=None)
-            elif 'view' in data_type:
-                if np.isnan(value):
-                    # No fill for zero values, only edges if enabled
-                    if edge:
-                        ax.plot(x, y, color='black', linewidth=0.1)
-                elif value >= 0:
-                    # Viridis colormap for positive values
-                    color = cmap(norm(value))
-                    ax.fill(x, y, alpha=alpha, fc=color, ec='black' if edge else None, linewidth=0.1)
-            else:
-                color = cmap(norm(value))
-                if edge:
-                    ax.fill(x, y, alpha=alpha, fc=color, ec='black', linewidth=0.1)
-                else:
-                    ax.fill(x, y, alpha=alpha, fc=color, ec=None)
-
-    crs_epsg_3857 = CRS.from_epsg(3857)
-
-    basemaps = {
-      'CartoDB dark': ctx.providers.CartoDB.DarkMatter,  # Popular dark option
-      'CartoDB light': ctx.providers.CartoDB.Positron,  # Popular dark option
-      'CartoDB voyager': ctx.providers.CartoDB.Voyager,  # Popular dark option
-      'CartoDB light no labels': ctx.providers.CartoDB.PositronNoLabels,  # Popular dark option
-      'CartoDB dark no labels': ctx.providers.CartoDB.DarkMatterNoLabels,
-    }
-    ctx.add_basemap(ax, crs=crs_epsg_3857, source=basemaps[basemap])
-    # if basemap == "dark":
-    #     ctx.add_basemap(ax, crs=crs_epsg_3857, source=ctx.providers.CartoDB.DarkMatter)
-    # elif basemap == 'light':
-    #     ctx.add_basemap(ax, crs=crs_epsg_3857, source=ctx.providers.CartoDB.Positron)
-    # elif basemap == 'voyager':
-    #     ctx.add_basemap(ax, crs=crs_epsg_3857, source=ctx.providers.CartoDB.Voyager)
+    # The grid cells form an axis-aligned regular lattice in lon/lat (the same
+    # layout grid_to_geodataframe produces), so the whole grid can be rendered
+    # as a single QuadMesh instead of one polygon artist per cell.
+    meshsize = float(np.mean(adjusted_meshsize))
+
+    # Reproject only the grid corners and derive the cell edges arithmetically
+    x_edges, y_edges = _mercator_grid_edges(vertices, grid.shape, meshsize)
+    values = np.asarray(grid, dtype=float)
+
+    # Restrict rendering to an EPSG:3857 viewport so only visible cells are
+    # meshed and drawn (O(visible cells) instead of O(total cells))
+    if extent is not None:
+        e_xmin, e_ymin, e_xmax, e_ymax = extent
+        j0 = max(int(np.searchsorted(x_edges, e_xmin)) - 1, 0)
+        j1 = min(int(np.searchsorted(x_edges, e_xmax)), values.shape[1])
+        i0 = max(int(np.searchsorted(y_edges, e_ymin)) - 1, 0)
+        i1 = min(int(np.searchsorted(y_edges, e_ymax)), values.shape[0])
+        values = values[i0:i1, j0:j1]
+        x_edges = x_edges[j0:j1 + 1]
+        y_edges = y_edges[i0:i1 + 1]
+
+    # Compute the coloring masks once over the full value array instead of
+    # branching per cell: every data type reduces to "which cells are filled"
+    # plus a vectorized colormap lookup.
+    nan_mask = np.isnan(values)
+
+    # Quantize values to uint8 colormap indices and color them through the
+    # colormap's lookup table. The facecolor array stays 8-bit per channel
+    # end to end -- the precision the renderer quantizes to anyway -- which
+    # quarters the memory traffic compared with float64 RGBA.
+    lut = cmap(np.arange(cmap.N), bytes=True)
+    normed = norm(np.nan_to_num(values, nan=0.0))
+    if isinstance(norm, mcolors.BoundaryNorm):
+        # BoundaryNorm already yields integer colormap indices
+        idx = np.asarray(normed, dtype=np.uint8)
+    else:
+        idx = (np.clip(normed, 0, 1) * (cmap.N - 1) + 0.5).astype(np.uint8)
+    fc = lut[idx]
+
+    if data_type == 'building_height':
+        # Gray fill for NaN values, no fill for zero values
+        fc[nan_mask] = np.array(np.array(mcolors.to_rgba('gray')) * 255, dtype=np.uint8)
+        filled = nan_mask | (values > 0)
+    elif data_type == 'canopy_height':
+        # No fill for zero values
+        filled = values != 0
+    elif 'view' in data_type:
+        # No fill for NaN values
+        filled = ~nan_mask & (values >= 0)
+    else:
+        filled = np.ones(values.shape, dtype=bool)
+
+    # Bake the overlay transparency into the facecolor array so a single
+    # QuadMesh renders all cells; unfilled cells get zero alpha.
+    fc[..., 3] = np.where(filled, fc[..., 3] * alpha, 0).astype(np.uint8)
+
+    if backend == 'datashader':
+        # Rasterize through datashader so matplotlib only ever draws one
+        # image at the figure's pixel resolution, regardless of grid size.
+        # datashader is an optional dependency, imported only when requested.
+        import datashader as ds
+        import datashader.transfer_functions as tf
+        import xarray as xr
+
+        plot_width = int(fig.get_size_inches()[0] * fig.dpi)
+        plot_height = int(fig.get_size_inches()[1] * fig.dpi)
+        cvs = ds.Canvas(plot_width=plot_width, plot_height=plot_height,
+                        x_range=(x_edges[0], x_edges[-1]),
+                        y_range=(y_edges[0], y_edges[-1]))
+        # Cell centers as raster coordinates; unfilled cells become NaN so
+        # shade leaves them transparent
+        da = xr.DataArray(np.where(filled, values, np.nan),
+                          coords={'y': (y_edges[:-1] + y_edges[1:]) / 2,
+                                  'x': (x_edges[:-1] + x_edges[1:]) / 2},
+                          dims=('y', 'x'))
+        agg = cvs.raster(da)
+        span = None
+        if not isinstance(norm, mcolors.BoundaryNorm):
+            span = (float(norm.vmin), float(norm.vmax))
+        img = tf.shade(agg, cmap=cmap, span=span, how='linear')
+        ax.imshow(img.to_pil(), alpha=alpha, interpolation='nearest',
+                  extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]))
+    else:
+        ax.pcolormesh(x_edges, y_edges, fc)
+        if edge:
+            # The lattice is regular, so cell borders collapse to one shared
+            # line per grid row/column: nx+ny+2 segments in one collection
+            # instead of four edge strokes per cell on the QuadMesh.
+            lines = ([((x, y_edges[0]), (x, y_edges[-1])) for x in x_edges]
+                     + [((x_edges[0], y), (x_edges[-1], y)) for y in y_edges])
+            ax.add_collection(LineCollection(lines, colors='black', linewidths=0.1))
 
     if data_type == 'building_height':
         buildings = kwargs.get('buildings', [])
         for building in buildings:
             polygon = Polygon(building['geometry']['coordinates'][0])
-            x, y = polygon.exterior.xy
-            x, y = zip(*[transformer.transform(lon, lat) for lat, lon in zip(x, y)])
+            # GeoJSON coordinates are stored as (lon, lat)
+            lons, lats = polygon.exterior.xy
+            x, y = transformer.transform(lons, lats)
             ax.plot(x, y, color='red', linewidth=1.5)
             # print(polygon)
 
-    # Safe calculation of plot limits
-    all_coords = np.array(vertices)
-    x, y = zip(*[transformer.transform(lon, lat) for lat, lon in all_coords])
-
-    # Calculate limits safely
-    x_min, x_max = min(x), max(x)
-    y_min, y_max = min(y), max(y)
+    # Safe calculation of plot limits from the reprojected cell edges
+    x_min, x_max = x_edges[0], x_edges[-1]
+    y_min, y_max = y_edges[0], y_edges[-1]
 
     if x_min != x_max and y_min != y_max and buf != 0:
         dist_x = x_max - x_min
@@ -416,8 +673,12 @@ def plot_grid(grid, origin, adjusted_meshsize, u_vec, v_vec, transformer, vertic
         ax.set_xlim(x_min, x_max)
         ax.set_ylim(y_min, y_max)
 
+    # Add the basemap for the final viewport using the module-level tile
+    # cache; basemap=None skips the tile fetch entirely
+    if basemap is not None:
+        _add_basemap(ax, basemap, zoom=basemap_zoom, cache_path=basemap_cache_path)
+
     plt.axis('off')
-    plt.tight_layout()
     plt.show()
 
 def visualize_land_cover_grid_on_map(grid, rectangle_vertices, meshsize, source = 'Urbanwatch', vmin=None, vmax=None, alpha=0.5, buf=0.2, edge=True, basemap='CartoDB light'):
@@ -545,19 +806,16 @@ def convert_coordinates(coords):
     return coords
 
 def calculate_centroid(coords):
-    lat_sum = sum(coord[0] for coord in coords)
-    lon_sum = sum(coord[1] for coord in coords)
-    return [lat_sum / len(coords), lon_sum / len(coords)]
+    # C-level reduction instead of Python generator sums
+    arr = np.asarray(coords, dtype=np.float64)
+    return arr.mean(axis=0).tolist()
 
 def calculate_center(features):
-    lats = []
-    lons = []
-    for feature in features:
-        coords = feature['geometry']['coordinates'][0]
-        for lat, lon in coords:
-            lats.append(lat)
-            lons.append(lon)
-    return sum(lats) / len(lats), sum(lons) / len(lons)
+    # Concatenate all rings once and average in a single vectorized pass
+    all_pts = np.concatenate([np.asarray(f['geometry']['coordinates'][0], dtype=np.float64)
+                              for f in features])
+    center = all_pts.mean(axis=0)
+    return center[0], center[1]
 
 def create_circle_polygon(center_lat, center_lon, radius_meters):
     """Create a circular polygon with given center and radius"""
@@ -655,8 +913,122 @@ def display_builing_ids_on_map(building_geojson, rectangle_vertices):
     # Save the map
     return m
 
+def init_grid_plot(grid, rectangle_vertices, meshsize, cmap='viridis', vmin=None, vmax=None,
+                   alpha=0.6, figsize=(12, 8), basemap='CartoDB light', basemap_zoom='auto',
+                   basemap_cache_path=None):
+    """Create a reusable numerical grid plot for frame-by-frame updates.
+
+    Builds the figure, basemap and QuadMesh once; subsequent frames go
+    through update_grid_plot, which only swaps the mesh's value array.
+    This avoids re-creating every artist (and re-fetching tiles) when
+    rendering many frames over the same area.
+
+    Args:
+        grid: 2D numpy array with the first frame's values
+        rectangle_vertices: List of (lon, lat) pairs defining the area
+        meshsize: Size of each grid cell in meters
+        cmap: Colormap to use (default: 'viridis')
+        vmin: Minimum value for colormap scaling (default: data minimum)
+        vmax: Maximum value for colormap scaling (default: data maximum)
+        alpha: Transparency of the grid overlay (default: 0.6)
+        figsize: Figure size in inches (default: (12, 8))
+        basemap: Basemap style, or None to skip tiles (default: 'CartoDB light')
+        basemap_zoom: Zoom level passed to contextily (default: 'auto')
+
+    Returns:
+        tuple: (fig, mesh) where mesh is the persistent QuadMesh artist
+    """
+    values = np.asarray(grid, dtype=float)
+    fig, ax = plt.subplots(figsize=figsize, constrained_layout=True)
+
+    x_edges, y_edges = _mercator_grid_edges(rectangle_vertices, values.shape, meshsize)
+    norm = mcolors.Normalize(vmin=vmin if vmin is not None else np.nanmin(values),
+                             vmax=vmax if vmax is not None else np.nanmax(values))
+    mesh = ax.pcolormesh(x_edges, y_edges, values, cmap=cmap, norm=norm, alpha=alpha)
+
+    ax.set_xlim(x_edges[0], x_edges[-1])
+    ax.set_ylim(y_edges[0], y_edges[-1])
+    if basemap is not None:
+        _add_basemap(ax, basemap, zoom=basemap_zoom, cache_path=basemap_cache_path)
+    ax.set_axis_off()
+    return fig, mesh
+
+def update_grid_plot(mesh, grid):
+    """Push new values into a plot created by init_grid_plot.
+
+    Only the QuadMesh color array changes; axes, basemap and layout are
+    reused, so a frame costs one colormap pass plus the draw.
+
+    Args:
+        mesh: QuadMesh returned by init_grid_plot
+        grid: 2D numpy array with the same shape as the initial grid
+    """
+    mesh.set_array(np.asarray(grid, dtype=float))
+    mesh.figure.canvas.draw_idle()
+
+def plot_grid_to_png(grid, rectangle_vertices, meshsize, path, cmap='viridis', vmin=None, vmax=None,
+                     alpha=0.6, basemap='CartoDB light', basemap_zoom='auto'):
+    """Render a numerical grid straight to a PNG file without matplotlib.
+
+    For headless batch export the figure/axes/artist machinery is pure
+    overhead: this composites the quantized uint8 RGBA grid over the cached
+    basemap tiles with plain numpy and writes the result with Pillow.
+
+    Args:
+        grid: 2D numpy array of cell values
+        rectangle_vertices: List of (lon, lat) pairs defining the area
+        meshsize: Size of each grid cell in meters
+        path: Output PNG file path
+        cmap: Colormap name (default: 'viridis')
+        vmin: Minimum value for colormap scaling (default: data minimum)
+        vmax: Maximum value for colormap scaling (default: data maximum)
+        alpha: Transparency of the grid overlay (default: 0.6)
+        basemap: Basemap style, or None for a transparent background
+        basemap_zoom: Zoom level passed to contextily (default: 'auto')
+    """
+    from PIL import Image
+
+    values = np.asarray(grid, dtype=float)
+    x_edges, y_edges = _mercator_grid_edges(rectangle_vertices, values.shape, meshsize)
+
+    # Quantize values through the colormap lookup table as uint8 RGBA
+    colormap = plt.get_cmap(cmap)
+    lut = colormap(np.arange(colormap.N), bytes=True)
+    norm = mcolors.Normalize(vmin=vmin if vmin is not None else np.nanmin(values),
+                             vmax=vmax if vmax is not None else np.nanmax(values))
+    idx = (np.clip(norm(np.nan_to_num(values, nan=0.0)), 0, 1) * (colormap.N - 1) + 0.5).astype(np.uint8)
+    fg = lut[idx]
+    fg[..., 3] = np.where(np.isnan(values), 0, int(alpha * 255))
+    # Grid row 0 sits at the southern edge; image row 0 is the top
+    fg = fg[::-1]
+
+    if basemap is None:
+        Image.fromarray(fg).save(path)
+        return
+
+    bg, extent = _fetch_basemap_image(round(x_edges[0]), round(y_edges[0]),
+                                      round(x_edges[-1]), round(y_edges[-1]),
+                                      basemap, basemap_zoom)
+    bxmin, bxmax, bymin, bymax = extent
+    h, w = bg.shape[:2]
+
+    # Pixel window of the grid bounds inside the (larger) tile mosaic
+    c0 = max(int((x_edges[0] - bxmin) / (bxmax - bxmin) * w), 0)
+    c1 = min(int(np.ceil((x_edges[-1] - bxmin) / (bxmax - bxmin) * w)), w)
+    r0 = max(int((bymax - y_edges[-1]) / (bymax - bymin) * h), 0)
+    r1 = min(int(np.ceil((bymax - y_edges[0]) / (bymax - bymin) * h)), h)
+
+    bg_crop = bg[r0:r1, c0:c1, :3].astype(np.float32)
+    fg_px = np.asarray(Image.fromarray(fg).resize((c1 - c0, r1 - r0), Image.NEAREST),
+                       dtype=np.float32)
+
+    # Straight alpha blend of the grid overlay onto the tile background
+    a = fg_px[..., 3:] / 255.0
+    out = (fg_px[..., :3] * a + bg_crop * (1.0 - a)).astype(np.uint8)
+    Image.fromarray(out).save(path)
+
 def visualize_landcover_grid_on_basemap(landcover_grid, rectangle_vertices, meshsize, source='Standard', alpha=0.6, figsize=(12, 8), 
-                                     basemap='CartoDB light', show_edge=False, edge_color='black', edge_width=0.5):
+                                     basemap='CartoDB light', basemap_zoom='auto', basemap_cache_path=None, show_edge=False, edge_color='black', edge_width=0.5):
     """Visualizes a land cover grid GeoDataFrame using predefined color schemes.
     
     Args:
@@ -673,7 +1045,7 @@ def visualize_landcover_grid_on_basemap(landcover_grid, rectangle_vertices, mesh
     # Get land cover classes and colors
     land_cover_classes = get_land_cover_classes(source)
 
-    gdf = grid_to_geodataframe(landcover_grid, rectangle_vertices, meshsize)
+    gdf_web = _grid_gdf_web(landcover_grid, rectangle_vertices, meshsize)
     
     # Convert RGB tuples to normalized RGB values
     colors = [(r/255, g/255, b/255) for (r,g,b) in land_cover_classes.keys()]
@@ -685,47 +1057,37 @@ def visualize_landcover_grid_on_basemap(landcover_grid, rectangle_vertices, mesh
     bounds = np.arange(len(colors) + 1)
     norm = BoundaryNorm(bounds, cmap.N)
     
-    # Convert to Web Mercator
-    gdf_web = gdf.to_crs(epsg=3857)
-    
-    # Create figure and axis
-    fig, ax = plt.subplots(figsize=figsize)
+    # Create figure and axis; constrained layout avoids a per-call
+    # tight_layout artist scan
+    fig, ax = plt.subplots(figsize=figsize, constrained_layout=True)
+
+    # Plot all grid cells as a single collection
+    _plot_gdf_cells(ax, gdf_web, cmap, norm, alpha,
+                    edge_color=edge_color if show_edge else 'none',
+                    edge_width=edge_width if show_edge else 0)
+
+    # Build the colorbar from an explicit ScalarMappable instead of the
+    # GeoPandas legend machinery, which introspects every plotted artist
+    mappable = plt.cm.ScalarMappable(norm=norm, cmap=cmap)
+    fig.colorbar(mappable, ax=ax,
+                 label='Land Cover Class',
+                 ticks=bounds[:-1] + 0.5,
+                 boundaries=bounds,
+                 format=lambda x, p: list(land_cover_classes.values())[int(x)])
     
-    # Plot the GeoDataFrame
-    gdf_web.plot(column='value',
-                 ax=ax,
-                 alpha=alpha,
-                 cmap=cmap,
-                 norm=norm,
-                 legend=True,
-                 legend_kwds={
-                     'label': 'Land Cover Class',
-                     'ticks': bounds[:-1] + 0.5,
-                     'boundaries': bounds,
-                     'format': lambda x, p: list(land_cover_classes.values())[int(x)]
-                 },
-                 edgecolor=edge_color if show_edge else 'none',
-                 linewidth=edge_width if show_edge else 0)
-    
-    # Add basemap
-    basemaps = {
-        'CartoDB dark': ctx.providers.CartoDB.DarkMatter,
-        'CartoDB light': ctx.providers.CartoDB.Positron,
-        'CartoDB voyager': ctx.providers.CartoDB.Voyager,
-        'CartoDB light no labels': ctx.providers.CartoDB.PositronNoLabels,
-        'CartoDB dark no labels': ctx.providers.CartoDB.DarkMatterNoLabels,
-    }
-    ctx.add_basemap(ax, source=basemaps[basemap])
+    # Add basemap through the module-level tile cache; basemap=None skips
+    # the tile fetch entirely
+    if basemap is not None:
+        _add_basemap(ax, basemap, zoom=basemap_zoom, cache_path=basemap_cache_path)
     
     # Set title and remove axes
     ax.set_axis_off()
-    
-    plt.tight_layout()
+
     plt.show()
 
 def visualize_numerical_grid_on_basemap(grid, rectangle_vertices, meshsize, value_name="value", cmap='viridis', vmin=None, vmax=None, 
-                                          alpha=0.6, figsize=(12, 8), basemap='CartoDB light',
-                                          show_edge=False, edge_color='black', edge_width=0.5):
+                                          alpha=0.6, figsize=(12, 8), basemap='CartoDB light', basemap_zoom='auto',
+                                          basemap_cache_path=None, show_edge=False, edge_color='black', edge_width=0.5):
     """Visualizes a numerical grid GeoDataFrame (e.g., heights) on a basemap.
     
     Args:
@@ -742,38 +1104,43 @@ def visualize_numerical_grid_on_basemap(grid, rectangle_vertices, meshsize, valu
         edge_width: Width of cell edges (default: 0.5)
     """
 
-    gdf = grid_to_geodataframe(grid, rectangle_vertices, meshsize)
+    # Create figure and axis; constrained layout avoids a per-call
+    # tight_layout artist scan
+    fig, ax = plt.subplots(figsize=figsize, constrained_layout=True)
 
-    # Convert to Web Mercator
-    gdf_web = gdf.to_crs(epsg=3857)
-    
-    # Create figure and axis
-    fig, ax = plt.subplots(figsize=figsize)
-    
-    # Plot the GeoDataFrame
-    gdf_web.plot(column='value',
-                 ax=ax,
-                 alpha=alpha,
-                 cmap=cmap,
-                 vmin=vmin,
-                 vmax=vmax,
-                 legend=True,
-                 legend_kwds={'label': value_name},
-                 edgecolor=edge_color if show_edge else 'none',
-                 linewidth=edge_width if show_edge else 0)
+    # Explicit normalization shared by the plot and the colorbar
+    norm = mcolors.Normalize(vmin=vmin if vmin is not None else np.nanmin(grid),
+                             vmax=vmax if vmax is not None else np.nanmax(grid))
+
+    if show_edge:
+        # Per-cell polygons are only needed when edges are stroked
+        gdf_web = _grid_gdf_web(grid, rectangle_vertices, meshsize)
+        _plot_gdf_cells(ax, gdf_web, cmap, norm, alpha,
+                        edge_color=edge_color, edge_width=edge_width)
+    else:
+        # The grid is an axis-aligned regular lattice, so the plot reduces
+        # to one textured quad: no GeoDataFrame, no per-cell geometry
+        values = np.asarray(grid, dtype=float)
+        x_edges, y_edges = _mercator_grid_edges(rectangle_vertices, values.shape, meshsize)
+        # Match the plotted array to the canvas pixel budget
+        canvas_w, canvas_h = (fig.get_size_inches() * fig.dpi).astype(int)
+        values = _downsample_to_canvas(values, canvas_h, canvas_w)
+        ax.imshow(values, extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+                  origin='lower', cmap=cmap, norm=norm, alpha=alpha,
+                  interpolation='nearest')
+        ax.set_aspect('equal')
+
+    # Build the colorbar from an explicit ScalarMappable instead of the
+    # GeoPandas legend machinery, which introspects every plotted artist
+    mappable = plt.cm.ScalarMappable(norm=norm, cmap=cmap)
+    fig.colorbar(mappable, ax=ax, label=value_name)
     
-    # Add basemap
-    basemaps = {
-        'CartoDB dark': ctx.providers.CartoDB.DarkMatter,
-        'CartoDB light': ctx.providers.CartoDB.Positron,
-        'CartoDB voyager': ctx.providers.CartoDB.Voyager,
-        'CartoDB light no labels': ctx.providers.CartoDB.PositronNoLabels,
-        'CartoDB dark no labels': ctx.providers.CartoDB.DarkMatterNoLabels,
-    }
-    ctx.add_basemap(ax, source=basemaps[basemap])
+    # Add basemap through the module-level tile cache; basemap=None skips
+    # the tile fetch entirely
+    if basemap is not None:
+        _add_basemap(ax, basemap, zoom=basemap_zoom, cache_path=basemap_cache_path)
     
     # Set title and remove axes
     ax.set_axis_off()
-    
-    plt.tight_layout()
+
     plt.show()
\ No newline at end of file
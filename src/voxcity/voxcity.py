@@ -16,6 +16,10 @@ The main functions are:
 
 import numpy as np
 import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from numba import njit, prange
 
 # Local application/library specific imports
 from .download.mbfp import get_mbfp_geojson
@@ -60,6 +64,103 @@ from .utils.visualization import (
     visualize_numerical_grid_on_basemap,
 )
 
+@lru_cache(maxsize=8)
+def _cached_roi(rectangle_vertices_key):
+    """Memoized Earth Engine ROI for a vertex tuple.
+
+    get_roi is a pure function of the rectangle vertices, and several grid
+    builders need the same ROI within one get_voxcity run.
+    """
+    return get_roi([list(v) for v in rectangle_vertices_key])
+
+def _get_roi(rectangle_vertices):
+    """Returns the (cached) Earth Engine ROI for the given vertices."""
+    return _cached_roi(tuple(map(tuple, rectangle_vertices)))
+
+@lru_cache(maxsize=8)
+def _cached_roi_buffered(rectangle_vertices_key, buffer_distance):
+    """Memoized buffered ROI; buffering is a server-side EE operation."""
+    return _cached_roi(rectangle_vertices_key).buffer(buffer_distance)
+
+def _get_roi_buffered(rectangle_vertices, buffer_distance):
+    """Returns the (cached) buffered Earth Engine ROI for the given vertices."""
+    return _cached_roi_buffered(tuple(map(tuple, rectangle_vertices)), buffer_distance)
+
+@lru_cache(maxsize=8)
+def _vis_height(meshsize):
+    """Height in voxels of the fixed 550m visualization volume.
+
+    Memoized so pipelines looping over tiles with one meshsize resolve
+    it once; uses the same half-up rounding as the voxel kernels.
+    """
+    return int(550 / meshsize + 0.5)
+
+def _geotiff_cache_path(output_dir, prefix, rectangle_vertices, source, meshsize, extra_params=None):
+    """Builds a content-addressed GeoTIFF path for one download request.
+
+    The filename embeds a digest of everything that determines the raster
+    contents (area, source, resolution and any source-specific parameters),
+    so an existing file can safely be reused instead of re-downloading, and
+    different areas or sources in the same output_dir never collide.
+
+    Args:
+        output_dir: Directory where GeoTIFFs are saved
+        prefix: Human-readable filename prefix (e.g. 'land_cover')
+        rectangle_vertices: List of (lon, lat) coordinates defining the area
+        source: Data source name
+        meshsize: Size of each grid cell in meters
+        extra_params: Optional tuple of source-specific parameters
+
+    Returns:
+        str: Path of the form <output_dir>/<prefix>_<digest>.tif
+    """
+    key = (tuple(map(tuple, rectangle_vertices)), source, meshsize, extra_params)
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    return os.path.join(output_dir, f"{prefix}_{digest}.tif")
+
+# Downloaded building footprints keyed on provider and area, so primary and
+# complementary fetches from the same provider only hit the network once
+_BUILDING_GEOJSON_CACHE = {}
+
+def _load_building_geojson(source, rectangle_vertices, output_dir, maptiler_API_key=None, file_path=None):
+    """Fetches building footprint GeoJSON for an area from one provider.
+
+    Results are cached per (source, area, path) so that requesting the same
+    provider as both primary and complementary source, or across repeated
+    runs in one session, downloads only once.
+
+    Args:
+        source: Building data source name
+        rectangle_vertices: List of (lon, lat) coordinates defining the area
+        output_dir: Directory for providers that save intermediate files
+        maptiler_API_key: API key for the OpenMapTiles provider
+        file_path: Path to the local file for the 'Local file' provider
+
+    Returns:
+        list: GeoJSON features from the requested provider
+    """
+    key = (source, tuple(map(tuple, rectangle_vertices)), file_path)
+    if key in _BUILDING_GEOJSON_CACHE:
+        return _BUILDING_GEOJSON_CACHE[key]
+    if source == 'Microsoft Building Footprints':
+        geojson_data = get_mbfp_geojson(output_dir, rectangle_vertices)
+    elif source == 'OpenStreetMap':
+        geojson_data = load_geojsons_from_openstreetmap(rectangle_vertices)
+    elif source == 'OSM Buildings':
+        geojson_data = load_geojsons_from_osmbuildings(rectangle_vertices)
+    elif source == 'EUBUCCO v0.1':
+        geojson_data = load_geojson_from_eubucco(rectangle_vertices, output_dir)
+    elif source == "OpenMapTiles":
+        geojson_data = load_geojsons_from_openmaptiles(rectangle_vertices, maptiler_API_key)
+    elif source == "Overture":
+        geojson_data = load_geojsons_from_overture(rectangle_vertices)
+    elif source == "Local file":
+        _, extension = os.path.splitext(file_path)
+        if extension == ".gpkg":
+            geojson_data = get_geojson_from_gpkg(file_path, rectangle_vertices)
+    _BUILDING_GEOJSON_CACHE[key] = geojson_data
+    return geojson_data
+
 def get_land_cover_grid(rectangle_vertices, meshsize, source, output_dir, **kwargs):
     """Creates a grid of land cover classifications.
 
@@ -71,6 +172,7 @@ def get_land_cover_grid(rectangle_vertices, meshsize, source, output_dir, **kwar
         **kwargs: Additional arguments including:
             - esri_landcover_year: Year for ESRI land cover data
             - dynamic_world_date: Date for Dynamic World data
+            - cache_geotiff: Whether to reuse a previously downloaded GeoTIFF
             - gridvis: Whether to visualize the grid
 
     Returns:
@@ -85,31 +187,37 @@ def get_land_cover_grid(rectangle_vertices, meshsize, source, output_dir, **kwar
 
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
-    geotiff_path = os.path.join(output_dir, "land_cover.tif")
+    esri_landcover_year = kwargs.get("esri_landcover_year")
+    dynamic_world_date = kwargs.get("dynamic_world_date")
+    geotiff_path = _geotiff_cache_path(output_dir, "land_cover", rectangle_vertices, source,
+                                       meshsize, (esri_landcover_year, dynamic_world_date))
+    cache_geotiff = kwargs.get("cache_geotiff", True)
 
     # Get land cover data based on selected source
-    if source == 'Urbanwatch':
-        roi = get_roi(rectangle_vertices)
+    if source == 'OpenStreetMap':
+        # For OSM, we get data directly as GeoJSON instead of GeoTIFF
+        land_cover_geojson = load_land_cover_geojson_from_osm(rectangle_vertices)
+    elif cache_geotiff and os.path.exists(geotiff_path):
+        # Content-addressed filename guarantees the cached raster matches
+        # this area, source and resolution, so skip the download entirely
+        print(f"Reusing cached GeoTIFF: {geotiff_path}")
+    elif source == 'Urbanwatch':
+        roi = _get_roi(rectangle_vertices)
         collection_name = "projects/sat-io/open-datasets/HRLC/urban-watch-cities"
         image = get_ee_image_collection(collection_name, roi)
         save_geotiff(image, geotiff_path)
     elif source == 'ESA WorldCover':
-        roi = get_roi(rectangle_vertices)
+        roi = _get_roi(rectangle_vertices)
         save_geotiff_esa_land_cover(roi, geotiff_path)
     elif source == 'ESRI 10m Annual Land Cover':
-        esri_landcover_year = kwargs.get("esri_landcover_year")
-        roi = get_roi(rectangle_vertices)
+        roi = _get_roi(rectangle_vertices)
         save_geotiff_esri_landcover(roi, geotiff_path, year=esri_landcover_year)
     elif source == 'Dynamic World V1':
-        dynamic_world_date = kwargs.get("dynamic_world_date")
-        roi = get_roi(rectangle_vertices)
+        roi = _get_roi(rectangle_vertices)
         save_geotiff_dynamic_world_v1(roi, geotiff_path, dynamic_world_date)
     elif source == 'OpenEarthMapJapan':
-        save_oemj_as_geotiff(rectangle_vertices, geotiff_path)   
-    elif source == 'OpenStreetMap':
-        # For OSM, we get data directly as GeoJSON instead of GeoTIFF
-        land_cover_geojson = load_land_cover_geojson_from_osm(rectangle_vertices)
-    
+        save_oemj_as_geotiff(rectangle_vertices, geotiff_path)
+
     # Get mapping of land cover classes for the selected source
     land_cover_classes = get_land_cover_classes(source)
 
@@ -163,25 +271,14 @@ def get_building_height_grid(rectangle_vertices, meshsize, source, output_dir, *
 
     os.makedirs(output_dir, exist_ok=True)
     
-    # Get building data from primary source
-    if source == 'Microsoft Building Footprints':
-        geojson_data = get_mbfp_geojson(output_dir, rectangle_vertices)
-    elif source == 'OpenStreetMap':
-        geojson_data = load_geojsons_from_openstreetmap(rectangle_vertices)
-    elif source == "Open Building 2.5D Temporal":
+    # Get building data from primary source (cached per provider and area)
+    if source == "Open Building 2.5D Temporal":
         # Special case: directly creates grids without intermediate GeoJSON
         building_height_grid, building_min_height_grid, building_id_grid, filtered_buildings = create_building_height_grid_from_open_building_temporal_polygon(meshsize, rectangle_vertices, output_dir)
-    elif source == 'EUBUCCO v0.1':
-        geojson_data = load_geojson_from_eubucco(rectangle_vertices, output_dir)
-    elif source == "OpenMapTiles":
-        geojson_data = load_geojsons_from_openmaptiles(rectangle_vertices, kwargs["maptiler_API_key"])
-    elif source == "Overture":
-        geojson_data = load_geojsons_from_overture(rectangle_vertices)
-    elif source == "Local file":
-        # Handle local GPKG files
-        _, extension = os.path.splitext(kwargs["building_path"])
-        if extension == ".gpkg":
-            geojson_data = get_geojson_from_gpkg(kwargs["building_path"], rectangle_vertices)
+    else:
+        geojson_data = _load_building_geojson(source, rectangle_vertices, output_dir,
+                                              maptiler_API_key=kwargs.get("maptiler_API_key"),
+                                              file_path=kwargs.get("building_path"))
     
     # Check for complementary building data source
     building_complementary_source = kwargs.get("building_complementary_source") 
@@ -194,29 +291,17 @@ def get_building_height_grid(rectangle_vertices, meshsize, source, output_dir, *
         # Handle complementary source
         if building_complementary_source == "Open Building 2.5D Temporal":
             # Special case: use temporal height data as complement
-            roi = get_roi(rectangle_vertices)
+            roi = _get_roi(rectangle_vertices)
             os.makedirs(output_dir, exist_ok=True)
             geotiff_path_comp = os.path.join(output_dir, "building_height.tif")
             save_geotiff_open_buildings_temporal(roi, geotiff_path_comp)
             building_height_grid, building_min_height_grid, building_id_grid, filtered_buildings = create_building_height_grid_from_geojson_polygon(geojson_data, meshsize, rectangle_vertices, geotiff_path_comp=geotiff_path_comp)   
         else:
-            # Get complementary data from other sources
-            if building_complementary_source == 'Microsoft Building Footprints':
-                geojson_data_comp = get_mbfp_geojson(output_dir, rectangle_vertices)
-            elif building_complementary_source == 'OpenStreetMap':
-                geojson_data_comp = load_geojsons_from_openstreetmap(rectangle_vertices)
-            elif building_complementary_source == 'OSM Buildings':
-                geojson_data_comp = load_geojsons_from_osmbuildings(rectangle_vertices)
-            elif building_complementary_source == 'EUBUCCO v0.1':
-                geojson_data_comp = load_geojson_from_eubucco(rectangle_vertices, output_dir)
-            elif building_complementary_source == "OpenMapTiles":
-                geojson_data_comp = load_geojsons_from_openmaptiles(rectangle_vertices, kwargs["maptiler_API_key"])
-            elif building_complementary_source == "Overture":
-                geojson_data_comp = load_geojsons_from_overture(rectangle_vertices)
-            elif building_complementary_source == "Local file":
-                _, extension = os.path.splitext(kwargs["building_complementary_path"])
-                if extension == ".gpkg":
-                    geojson_data_comp = get_geojson_from_gpkg(kwargs["building_complementary_path"], rectangle_vertices)
+            # Get complementary data (shares the provider cache with the
+            # primary fetch, so the same source is downloaded only once)
+            geojson_data_comp = _load_building_geojson(building_complementary_source, rectangle_vertices, output_dir,
+                                                       maptiler_API_key=kwargs.get("maptiler_API_key"),
+                                                       file_path=kwargs.get("building_complementary_path"))
             
             # Option to complement footprints only or both footprints and heights
             complement_building_footprints = kwargs.get("complement_building_footprints")
@@ -238,6 +323,7 @@ def get_canopy_height_grid(rectangle_vertices, meshsize, source, output_dir, **k
         source: Data source for canopy heights
         output_dir: Directory to save output files
         **kwargs: Additional arguments including:
+            - cache_geotiff: Whether to reuse a previously downloaded GeoTIFF
             - gridvis: Whether to visualize the grid
 
     Returns:
@@ -251,19 +337,25 @@ def get_canopy_height_grid(rectangle_vertices, meshsize, source, output_dir, **k
     initialize_earth_engine()
 
     os.makedirs(output_dir, exist_ok=True)
-    geotiff_path = os.path.join(output_dir, "canopy_height.tif")
-    
-    # Get region of interest and canopy height data
-    roi = get_roi(rectangle_vertices)
-    if source == 'High Resolution 1m Global Canopy Height Maps':
-        collection_name = "projects/meta-forest-monitoring-okw37/assets/CanopyHeight"  
-        image = get_ee_image_collection(collection_name, roi)      
-    elif source == 'ETH Global Sentinel-2 10m Canopy Height (2020)':
-        collection_name = "users/nlang/ETH_GlobalCanopyHeight_2020_10m_v1"
-        image = get_ee_image(collection_name, roi)
-    
-    # Save canopy height data as GeoTIFF
-    save_geotiff(image, geotiff_path, resolution=meshsize)  
+    geotiff_path = _geotiff_cache_path(output_dir, "canopy_height", rectangle_vertices, source, meshsize)
+    cache_geotiff = kwargs.get("cache_geotiff", True)
+
+    if cache_geotiff and os.path.exists(geotiff_path):
+        # Content-addressed filename guarantees the cached raster matches
+        # this area, source and resolution, so skip the download entirely
+        print(f"Reusing cached GeoTIFF: {geotiff_path}")
+    else:
+        # Get region of interest and canopy height data
+        roi = _get_roi(rectangle_vertices)
+        if source == 'High Resolution 1m Global Canopy Height Maps':
+            collection_name = "projects/meta-forest-monitoring-okw37/assets/CanopyHeight"
+            image = get_ee_image_collection(collection_name, roi)
+        elif source == 'ETH Global Sentinel-2 10m Canopy Height (2020)':
+            collection_name = "users/nlang/ETH_GlobalCanopyHeight_2020_10m_v1"
+            image = get_ee_image(collection_name, roi)
+
+        # Save canopy height data as GeoTIFF
+        save_geotiff(image, geotiff_path, resolution=meshsize)
 
     # Create height grid from GeoTIFF
     canopy_height_grid = create_height_grid_from_geotiff_polygon(geotiff_path, meshsize, rectangle_vertices)
@@ -285,6 +377,7 @@ def get_dem_grid(rectangle_vertices, meshsize, source, output_dir, **kwargs):
         output_dir: Directory to save output files
         **kwargs: Additional arguments including:
             - dem_interpolation: Interpolation method for DEM
+            - cache_geotiff: Whether to reuse a previously downloaded GeoTIFF
             - gridvis: Whether to visualize the grid
 
     Returns:
@@ -297,25 +390,30 @@ def get_dem_grid(rectangle_vertices, meshsize, source, output_dir, **kwargs):
     # Initialize Earth Engine for accessing elevation data
     initialize_earth_engine()
 
-    geotiff_path = os.path.join(output_dir, "dem.tif")
+    geotiff_path = _geotiff_cache_path(output_dir, "dem", rectangle_vertices, source, meshsize)
+    cache_geotiff = kwargs.get("cache_geotiff", True)
 
-    # Add buffer around ROI to ensure smooth interpolation at edges
-    buffer_distance = 100
-    roi = get_roi(rectangle_vertices)
-    roi_buffered = roi.buffer(buffer_distance)
-    
-    # Get DEM data
-    image = get_dem_image(roi_buffered, source)
-    
-    # Save DEM data with appropriate resolution based on source
-    if source in ["England 1m DTM", 'DEM France 1m', 'DEM France 5m', 'AUSTRALIA 5M DEM']:
-        save_geotiff(image, geotiff_path, scale=meshsize, region=roi_buffered, crs='EPSG:4326')
-    elif source == 'USGS 3DEP 1m':
-        scale = max(meshsize, 1.25)
-        save_geotiff(image, geotiff_path, scale=scale, region=roi_buffered, crs='EPSG:4326')
+    if cache_geotiff and os.path.exists(geotiff_path):
+        # Content-addressed filename guarantees the cached raster matches
+        # this area, source and resolution, so skip the download entirely
+        print(f"Reusing cached GeoTIFF: {geotiff_path}")
     else:
-        # Default to 30m resolution for other sources
-        save_geotiff(image, geotiff_path, scale=30, region=roi_buffered)
+        # Add buffer around ROI to ensure smooth interpolation at edges
+        buffer_distance = 100
+        roi_buffered = _get_roi_buffered(rectangle_vertices, buffer_distance)
+
+        # Get DEM data
+        image = get_dem_image(roi_buffered, source)
+
+        # Save DEM data with appropriate resolution based on source
+        if source in ["England 1m DTM", 'DEM France 1m', 'DEM France 5m', 'AUSTRALIA 5M DEM']:
+            save_geotiff(image, geotiff_path, scale=meshsize, region=roi_buffered, crs='EPSG:4326')
+        elif source == 'USGS 3DEP 1m':
+            scale = max(meshsize, 1.25)
+            save_geotiff(image, geotiff_path, scale=scale, region=roi_buffered, crs='EPSG:4326')
+        else:
+            # Default to 30m resolution for other sources
+            save_geotiff(image, geotiff_path, scale=30, region=roi_buffered)
 
     # Create DEM grid with optional interpolation method
     dem_interpolation = kwargs.get("dem_interpolation")
@@ -328,6 +426,114 @@ def get_dem_grid(rectangle_vertices, meshsize, source, output_dir, **kwargs):
 
     return dem_grid
 
+def _flatten_building_segments(building_min_height_grid):
+    """Flattens the ragged per-cell building segment lists into CSR arrays.
+
+    Each cell of building_min_height_grid holds a Python list of
+    [min_height, max_height] pairs. The compiled voxel fill kernel cannot
+    iterate those objects, so they are packed once into a flat segment
+    table plus per-cell offsets.
+
+    Args:
+        building_min_height_grid: 2D object array of segment lists
+
+    Returns:
+        tuple:
+            - numpy.ndarray: (N, 2) float64 array of segment height pairs
+            - numpy.ndarray: (rows*cols + 1,) int64 CSR offsets per cell
+    """
+    rows, cols = building_min_height_grid.shape[:2]
+    # The nested array is usually a 2D object array, but it collapses to a
+    # regular 3D/4D array when every cell holds the same segment count
+    # (including the all-empty case); reshaping on the cell axes handles both
+    flat_cells = building_min_height_grid.reshape(rows * cols, *building_min_height_grid.shape[2:])
+    counts = np.fromiter((len(cell) for cell in flat_cells), dtype=np.int64,
+                         count=rows * cols)
+    offsets = np.zeros(rows * cols + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    segments = np.empty((offsets[-1], 2), dtype=np.float64)
+    if offsets[-1] == 0:
+        return segments, offsets
+    # Structure-of-arrays conversion: each occupied cell's segments are
+    # written straight into their CSR slot of the preallocated table, so
+    # the values buffer is built contiguous in one pass with no
+    # intermediate list of per-cell arrays to concatenate
+    for cell_idx in np.flatnonzero(counts):
+        start, stop = offsets[cell_idx], offsets[cell_idx + 1]
+        segments[start:stop] = np.asarray(flat_cells[cell_idx], dtype=np.float64).reshape(-1, 2)
+    return segments, offsets
+
+@njit(parallel=True, cache=True)
+def _replace_nan_flat(segments, replace_value):
+    """Replaces NaNs across the flat segment table in place.
+
+    The CSR layout makes the ragged per-cell data one contiguous float64
+    buffer, so the NaN sweep parallelizes trivially across rows.
+    """
+    for i in prange(segments.shape[0]):
+        for j in range(segments.shape[1]):
+            v = segments[i, j]
+            if v != v:
+                segments[i, j] = replace_value
+
+@njit(parallel=True, cache=True)
+def _max_surface_height(building_height_grid, dem_grid, tree_grid):
+    """Streaming maximum of building + DEM + tree heights per cell.
+
+    Equivalent to np.max(a + b + c) but without materializing the
+    full-grid sum temporary first.
+    """
+    rows, cols = dem_grid.shape
+    max_value = 0.0
+    for i in prange(rows):
+        local = 0.0
+        for j in range(cols):
+            value = building_height_grid[i, j] + dem_grid[i, j] + tree_grid[i, j]
+            if value > local:
+                local = value
+        max_value = max(max_value, local)
+    return max_value
+
+@njit(parallel=True, cache=True)
+def _fill_voxel_grid(voxel_grid, dem_grid, tree_grid, land_cover_grid, segments, offsets,
+                     voxel_size, trunk_height_ratio):
+    """Fills the 3D voxel grid column by column (compiled hot loop).
+
+    Mirrors the original per-cell Python loop of create_3d_voxel: underground
+    voxels get -1, the surface voxel takes the land cover code, tree crowns
+    get -2 and building segments get -3. Rows are processed in parallel.
+    """
+    rows, cols = dem_grid.shape
+    # Hoist the division out of the per-cell work; int(x * inv + 0.5) keeps
+    # the half-up rounding of the original int(x / voxel_size + 0.5) casts
+    inv_voxel = 1.0 / voxel_size
+    for i in prange(rows):
+        for j in range(cols):
+            # Ground level in voxel units (+1 to ensure space for surface features)
+            ground_level = int(dem_grid[i, j] * inv_voxel + 0.5) + 1
+
+            # Fill underground voxels with -1, then the surface land cover
+            # (+1 to avoid 0 values in land cover)
+            voxel_grid[i, j, :ground_level] = -1
+            voxel_grid[i, j, ground_level - 1] = land_cover_grid[i, j] + 1
+
+            # Trees - split into trunk and crown sections
+            tree_height = tree_grid[i, j]
+            if tree_height > 0:
+                crown_base_height_level = int(tree_height * trunk_height_ratio * inv_voxel + 0.5)
+                crown_top_height_level = int(tree_height * inv_voxel + 0.5)
+                # Ensure minimum crown height of 1 voxel
+                if crown_top_height_level == crown_base_height_level and crown_base_height_level > 0:
+                    crown_base_height_level -= 1
+                voxel_grid[i, j, ground_level + crown_base_height_level:ground_level + crown_top_height_level] = -2
+
+            # Buildings - handle multiple height segments per cell
+            cell = i * cols + j
+            for s in range(offsets[cell], offsets[cell + 1]):
+                building_min_height = int(segments[s, 0] * inv_voxel + 0.5)
+                building_height = int(segments[s, 1] * inv_voxel + 0.5)
+                voxel_grid[i, j, ground_level + building_min_height:ground_level + building_height] = -3
+
 def create_3d_voxel(building_height_grid_ori, building_min_height_grid_ori, building_id_grid_ori, land_cover_grid_ori, dem_grid_ori, tree_grid_ori, voxel_size, land_cover_source, **kwargs):
     """Creates a 3D voxel representation combining all input grids.
 
@@ -357,12 +563,12 @@ def create_3d_voxel(building_height_grid_ori, building_min_height_grid_ori, buil
 
     # Prepare and flip all input grids vertically for consistent orientation
     building_height_grid = np.flipud(np.nan_to_num(building_height_grid_ori, nan=10.0)) # Replace NaN values with 10m height
-    building_min_height_grid = np.flipud(replace_nan_in_nested(building_min_height_grid_ori)) # Replace NaN in nested arrays
     building_id_grid = np.flipud(building_id_grid_ori)
-    land_cover_grid = np.flipud(land_cover_grid_converted.copy()) + 1 # Add 1 to avoid 0 values in land cover
-    dem_grid = np.flipud(dem_grid_ori.copy()) - np.min(dem_grid_ori) # Normalize DEM to start at 0
-    dem_grid = process_grid(building_id_grid, dem_grid) # Process DEM based on building footprints
-    tree_grid = np.flipud(tree_grid_ori.copy())
+    land_cover_grid = np.flipud(land_cover_grid_converted) # View; the +1 offset is applied inside the fill kernel
+    # process_grid normalizes its result to start at 0, so the raw flipped
+    # view can go in directly without a pre-subtracted copy
+    dem_grid = process_grid(building_id_grid, np.flipud(dem_grid_ori)) # Process DEM based on building footprints
+    tree_grid = np.flipud(tree_grid_ori)
 
     # Validate input dimensions
     assert building_height_grid.shape == land_cover_grid.shape == dem_grid.shape == tree_grid.shape, "Input grids must have the same shape"
@@ -370,56 +576,27 @@ def create_3d_voxel(building_height_grid_ori, building_min_height_grid_ori, buil
     rows, cols = building_height_grid.shape
 
     # Calculate required height for 3D grid - add 1 to ensure enough space
-    max_height = int(np.ceil(np.max(building_height_grid + dem_grid + tree_grid) / voxel_size))+1
+    max_height = int(np.ceil(_max_surface_height(building_height_grid, dem_grid, tree_grid) / voxel_size))+1
 
-    # Initialize empty 3D grid
-    voxel_grid = np.zeros((rows, cols, max_height), dtype=np.int32)
+    # Initialize empty 3D grid; all voxel codes fit in a signed byte, and
+    # int8 quarters the memory bandwidth of every fill
+    voxel_grid = np.zeros((rows, cols, max_height), dtype=np.int8)
 
     # Get trunk height ratio for trees, default based on typical tree proportions
     trunk_height_ratio = kwargs.get("trunk_height_ratio")
     if trunk_height_ratio is None:
         trunk_height_ratio = 11.76 / 19.98  # Default ratio based on typical tree proportions
 
-    # Fill the 3D grid cell by cell
-    for i in range(rows):
-        for j in range(cols):
-            # Calculate ground level in voxel units (+1 to ensure space for surface features)
-            ground_level = int(dem_grid[i, j] / voxel_size + 0.5) + 1 
-
-            tree_height = tree_grid[i, j]
-            land_cover = land_cover_grid[i, j]
-
-            # Fill underground voxels with -1
-            voxel_grid[i, j, :ground_level] = -1
-
-            # Set surface land cover value
-            voxel_grid[i, j, ground_level-1] = land_cover
-
-            # Process trees - split into trunk and crown sections
-            if tree_height > 0:
-                # Calculate crown base and top heights
-                crown_base_height = (tree_height * trunk_height_ratio)
-                crown_base_height_level = int(crown_base_height / voxel_size + 0.5)
-                crown_top_height = tree_height
-                crown_top_height_level = int(crown_top_height / voxel_size + 0.5)
-                
-                # Ensure minimum crown height of 1 voxel
-                if (crown_top_height_level == crown_base_height_level) and (crown_base_height_level>0):
-                    crown_base_height_level -= 1
-                    
-                # Calculate tree start and end positions relative to ground level
-                tree_start = ground_level + crown_base_height_level
-                tree_end = ground_level + crown_top_height_level
-                
-                # Fill tree crown voxels with -2
-                voxel_grid[i, j, tree_start:tree_end] = -2
-
-            # Process buildings - handle multiple height segments
-            for k in building_min_height_grid[i, j]:
-                building_min_height = int(k[0] / voxel_size + 0.5)  # Lower height of building segment
-                building_height = int(k[1] / voxel_size + 0.5)      # Upper height of building segment
-                # Fill building voxels with -3
-                voxel_grid[i, j, ground_level+building_min_height:ground_level+building_height] = -3
+    # Pack the ragged building segment lists into flat CSR arrays; NaN heights
+    # are replaced with 10m on the flat float table, so the nested structure
+    # never has to be walked in Python (replace_nan_in_nested)
+    segments, offsets = _flatten_building_segments(np.flipud(building_min_height_grid_ori))
+    _replace_nan_flat(segments, 10.0)
+    _fill_voxel_grid(voxel_grid,
+                     np.ascontiguousarray(dem_grid, dtype=np.float64),
+                     np.ascontiguousarray(tree_grid, dtype=np.float64),
+                     np.ascontiguousarray(land_cover_grid, dtype=np.int32),
+                     segments, offsets, float(voxel_size), float(trunk_height_ratio))
 
     return voxel_grid
 
@@ -451,13 +628,14 @@ def create_3d_voxel_individuals(building_height_grid_ori, land_cover_grid_ori, d
     else:
         land_cover_grid_converted = land_cover_grid_ori      
 
-    # Prepare and flip all input grids vertically
-    building_height_grid = np.flipud(building_height_grid_ori.copy())
-    land_cover_grid = np.flipud(land_cover_grid_converted.copy()) + 1  # Add 1 to avoid 0 values
-    dem_grid = np.flipud(dem_grid_ori.copy()) - np.min(dem_grid_ori)  # Normalize DEM to start at 0
-    building_nr_grid = group_and_label_cells(np.flipud(building_height_grid_ori.copy()))
-    dem_grid = process_grid(building_nr_grid, dem_grid)  # Process DEM based on building footprints
-    tree_grid = np.flipud(tree_grid_ori.copy())
+    # Prepare and flip all input grids vertically (flipud returns views;
+    # nothing below mutates the inputs, so no defensive copies are needed)
+    building_height_grid = np.flipud(building_height_grid_ori)
+    land_cover_grid = np.flipud(land_cover_grid_converted)  # +1 offset applied at the ground-plane fill
+    building_nr_grid = group_and_label_cells(np.flipud(building_height_grid_ori))
+    # process_grid normalizes its result to start at 0
+    dem_grid = process_grid(building_nr_grid, np.flipud(dem_grid_ori))  # Process DEM based on building footprints
+    tree_grid = np.flipud(tree_grid_ori)
 
     # Validate input dimensions
     assert building_height_grid.shape == land_cover_grid.shape == dem_grid.shape == tree_grid.shape, "Input grids must have the same shape"
@@ -465,35 +643,31 @@ def create_3d_voxel_individuals(building_height_grid_ori, land_cover_grid_ori, d
     rows, cols = building_height_grid.shape
 
     # Calculate required height for 3D grid
-    max_height = int(np.ceil(np.max(building_height_grid + dem_grid + tree_grid) / voxel_size))
+    max_height = int(np.ceil(_max_surface_height(building_height_grid, dem_grid, tree_grid) / voxel_size))
 
     # Initialize empty 3D grids for each component
-    land_cover_voxel_grid = np.zeros((rows, cols, max_height), dtype=np.int32)
-    building_voxel_grid = np.zeros((rows, cols, max_height), dtype=np.int32)
-    tree_voxel_grid = np.zeros((rows, cols, max_height), dtype=np.int32)
-    dem_voxel_grid = np.zeros((rows, cols, max_height), dtype=np.int32)
-
-    # Fill individual component grids
-    for i in range(rows):
-        for j in range(cols):
-            ground_level = int(dem_grid[i, j] / voxel_size + 0.5)
-            building_height = int(building_height_grid[i, j] / voxel_size + 0.5)
-            tree_height = int(tree_grid[i, j] / voxel_size + 0.5)
-            land_cover = land_cover_grid[i, j]
-
-            # Fill underground cells with -1
-            dem_voxel_grid[i, j, :ground_level+1] = -1
-
-            # Set ground level cell to land cover
-            land_cover_voxel_grid[i, j, 0] = land_cover
-
-            # Fill tree crown with value -2
-            if tree_height > 0:
-                tree_voxel_grid[i, j, :tree_height] = -2
-
-            # Fill building with value -3
-            if building_height > 0:
-                building_voxel_grid[i, j, :building_height] = -3
+    land_cover_voxel_grid = np.zeros((rows, cols, max_height), dtype=np.int8)
+    building_voxel_grid = np.zeros((rows, cols, max_height), dtype=np.int8)
+    tree_voxel_grid = np.zeros((rows, cols, max_height), dtype=np.int8)
+    dem_voxel_grid = np.zeros((rows, cols, max_height), dtype=np.int8)
+
+    # Fill individual component grids with broadcast masks over a shared Z
+    # index instead of per-cell Python loops: each fill is one C-level
+    # masked write over contiguous memory
+    ground_level = np.floor(dem_grid / voxel_size + 0.5).astype(np.int32)
+    building_level = np.floor(building_height_grid / voxel_size + 0.5).astype(np.int32)
+    tree_level = np.floor(tree_grid / voxel_size + 0.5).astype(np.int32)
+    z_idx = np.arange(max_height)
+
+    # Underground cells (-1) reach up to and including the ground level
+    dem_voxel_grid[z_idx[None, None, :] <= ground_level[:, :, None]] = -1
+
+    # Ground plane takes the land cover codes (+1 to avoid 0 values)
+    land_cover_voxel_grid[:, :, 0] = land_cover_grid + 1
+
+    # Tree crowns (-2) and buildings (-3) fill from the base upward
+    tree_voxel_grid[z_idx[None, None, :] < tree_level[:, :, None]] = -2
+    building_voxel_grid[z_idx[None, None, :] < building_level[:, :, None]] = -3
     
     # Set default layered interval if not provided
     if not layered_interval:
@@ -501,13 +675,14 @@ def create_3d_voxel_individuals(building_height_grid_ori, land_cover_grid_ori, d
 
     # Create combined layered visualization
     extract_height = min(layered_interval, max_height)
-    layered_voxel_grid = np.zeros((rows, cols, layered_interval*4), dtype=np.int32)
+    layered_voxel_grid = np.zeros((rows, cols, layered_interval*4), dtype=np.int8)
     
-    # Stack components in layers with equal spacing
-    layered_voxel_grid[:, :, :extract_height] = dem_voxel_grid[:, :, :extract_height]
-    layered_voxel_grid[:, :, layered_interval:layered_interval+extract_height] = land_cover_voxel_grid[:, :, :extract_height]
-    layered_voxel_grid[:, :, 2*layered_interval:2*layered_interval+extract_height] = building_voxel_grid[:, :, :extract_height]
-    layered_voxel_grid[:, :, 3*layered_interval:3*layered_interval+extract_height] = tree_voxel_grid[:, :, :extract_height]
+    # Stack components in layers with equal spacing; scattering only the
+    # occupied voxels skips rewriting the mostly-zero slabs of each component
+    components = (dem_voxel_grid, land_cover_voxel_grid, building_voxel_grid, tree_voxel_grid)
+    for k, component in enumerate(components):
+        ii, jj, zz = np.nonzero(component[:, :, :extract_height])
+        layered_voxel_grid[ii, jj, k*layered_interval + zz] = component[ii, jj, zz]
 
     return land_cover_voxel_grid, building_voxel_grid, tree_voxel_grid, dem_voxel_grid, layered_voxel_grid
 
@@ -547,22 +722,38 @@ def get_voxcity(rectangle_vertices, building_source, land_cover_source, canopy_h
     # Remove 'output_dir' from kwargs to prevent duplication
     kwargs.pop('output_dir', None)
 
-    # Generate all required 2D grids
-    land_cover_grid = get_land_cover_grid(rectangle_vertices, meshsize, land_cover_source, output_dir, **kwargs)
-    building_height_grid, building_min_height_grid, building_id_grid, building_geojson = get_building_height_grid(rectangle_vertices, meshsize, building_source, output_dir, **kwargs)
-    
+    # Generate all required 2D grids. Each fetch is dominated by network
+    # I/O, so they can optionally overlap in a thread pool.
+    parallel_download = kwargs.get("parallel_download", False)
+    if parallel_download:
+        # Matplotlib is not thread-safe, so grid visualization is forced
+        # off inside the workers
+        fetch_kwargs = dict(kwargs, gridvis=False)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            land_cover_future = executor.submit(get_land_cover_grid, rectangle_vertices, meshsize, land_cover_source, output_dir, **fetch_kwargs)
+            building_future = executor.submit(get_building_height_grid, rectangle_vertices, meshsize, building_source, output_dir, **fetch_kwargs)
+            canopy_future = executor.submit(get_canopy_height_grid, rectangle_vertices, meshsize, canopy_height_source, output_dir, **fetch_kwargs)
+            dem_future = None
+            if dem_source != "Flat":
+                dem_future = executor.submit(get_dem_grid, rectangle_vertices, meshsize, dem_source, output_dir, **fetch_kwargs)
+            land_cover_grid = land_cover_future.result()
+            building_height_grid, building_min_height_grid, building_id_grid, building_geojson = building_future.result()
+            canopy_height_grid = canopy_future.result()
+            dem_grid = np.zeros_like(land_cover_grid) if dem_future is None else dem_future.result()
+    else:
+        land_cover_grid = get_land_cover_grid(rectangle_vertices, meshsize, land_cover_source, output_dir, **kwargs)
+        building_height_grid, building_min_height_grid, building_id_grid, building_geojson = get_building_height_grid(rectangle_vertices, meshsize, building_source, output_dir, **kwargs)
+        canopy_height_grid = get_canopy_height_grid(rectangle_vertices, meshsize, canopy_height_source, output_dir, **kwargs)
+        
+        # Handle DEM - either flat or from source
+        if dem_source == "Flat":
+            dem_grid = np.zeros_like(land_cover_grid)
+        else:
+            dem_grid = get_dem_grid(rectangle_vertices, meshsize, dem_source, output_dir, **kwargs)
+
     # Save building data to GeoJSON
     save_path = f"{output_dir}/building.geojson"
     save_geojson(building_geojson, save_path)
-    
-    # Get canopy height data
-    canopy_height_grid = get_canopy_height_grid(rectangle_vertices, meshsize, canopy_height_source, output_dir, **kwargs)
-    
-    # Handle DEM - either flat or from source
-    if dem_source == "Flat":
-        dem_grid = np.zeros_like(land_cover_grid)
-    else:
-        dem_grid = get_dem_grid(rectangle_vertices, meshsize, dem_source, output_dir, **kwargs)
 
     # Apply minimum canopy height threshold if specified
     min_canopy_height = kwargs.get("min_canopy_height")
@@ -576,21 +767,27 @@ def get_voxcity(rectangle_vertices, building_source, land_cover_source, canopy_h
         w_peri = int(remove_perimeter_object * building_height_grid.shape[0] + 0.5)
         h_peri = int(remove_perimeter_object * building_height_grid.shape[1] + 0.5)
         
-        # Clear canopy heights in perimeter
-        canopy_height_grid[:w_peri, :] = canopy_height_grid[-w_peri:, :] = canopy_height_grid[:, :h_peri] = canopy_height_grid[:, -h_peri:] = 0
+        # Clear canopy heights in perimeter with one masked pass instead of
+        # four overlapping slice stores
+        rr, cc = np.ogrid[:canopy_height_grid.shape[0], :canopy_height_grid.shape[1]]
+        border = ((rr < w_peri) | (rr >= canopy_height_grid.shape[0] - w_peri) |
+                  (cc < h_peri) | (cc >= canopy_height_grid.shape[1] - h_peri))
+        canopy_height_grid[border] = 0
 
         # Find building IDs in perimeter regions
         ids1 = np.unique(building_id_grid[:w_peri, :][building_id_grid[:w_peri, :] > 0])
         ids2 = np.unique(building_id_grid[-w_peri:, :][building_id_grid[-w_peri:, :] > 0])
         ids3 = np.unique(building_id_grid[:, :h_peri][building_id_grid[:, :h_peri] > 0])
         ids4 = np.unique(building_id_grid[:, -h_peri:][building_id_grid[:, -h_peri:] > 0])
-        remove_ids = np.concatenate((ids1, ids2, ids3, ids4))
-        
-        # Remove buildings in perimeter
-        for remove_id in remove_ids:
-            positions = np.where(building_id_grid == remove_id)
-            building_height_grid[positions] = 0
-            building_min_height_grid[positions] = [[] for _ in range(len(building_min_height_grid[positions]))]
+        remove_ids = np.unique(np.concatenate((ids1, ids2, ids3, ids4)))
+
+        # Remove buildings in perimeter with a single membership pass over
+        # the ID grid instead of one full-grid scan per ID
+        remove_mask = np.isin(building_id_grid, remove_ids)
+        building_height_grid[remove_mask] = 0
+        flat_min_heights = building_min_height_grid.ravel()
+        for idx in np.flatnonzero(remove_mask.ravel()):
+            flat_min_heights[idx] = []
 
     # Visualize 2D grids on map if requested
     mapvis = kwargs.get("mapvis")
@@ -652,15 +849,82 @@ def get_voxcity(rectangle_vertices, building_source, land_cover_source, canopy_h
     # Visualize 3D model if requested
     voxelvis = kwargs.get("voxelvis")
     if voxelvis:
-        # Create taller visualization grid with fixed height
-        new_height = int(550/meshsize+0.5)     
-        voxcity_grid_vis = np.zeros((voxcity_grid.shape[0], voxcity_grid.shape[1], new_height))
-        voxcity_grid_vis[:, :, :voxcity_grid.shape[2]] = voxcity_grid
+        # Create taller visualization grid with fixed height. np.empty maps
+        # untouched zero pages, so only the copied block and the zeroed tail
+        # slab are ever faulted in and written - the full volume is never
+        # initialized twice the way zeros-then-copy (or np.pad) does it
+        new_height = _vis_height(meshsize)
+        # Voxel class codes and the -99 marker all fit a signed byte; keeping
+        # the vis grid int8 avoids 8x the memory traffic of a float64 volume
+        src = np.asarray(voxcity_grid, dtype=np.int8)
+        depth = min(src.shape[2], new_height)
+        voxcity_grid_vis = np.empty((src.shape[0], src.shape[1], new_height), dtype=np.int8)
+        voxcity_grid_vis[:, :, :depth] = src[:, :, :depth]
+        voxcity_grid_vis[:, :, depth:] = 0
         voxcity_grid_vis[-1, -1, -1] = -99  # Add marker to fix camera location and angle of view
         visualize_3d_voxel(voxcity_grid_vis, voxel_size=meshsize, save_path=kwargs["voxelvis_img_save_path"])
 
     return voxcity_grid, building_height_grid, building_min_height_grid, building_id_grid, canopy_height_grid, land_cover_grid, dem_grid, building_geojson
 
+def replace_nan_in_nested_(arr, replace_value=10.0):
+    """In-place variant of replace_nan_in_nested.
+
+    Mutates the object array directly, avoiding any new allocation for
+    callers that own the input; modified cells get fresh lists written
+    into their array slot, so shared cell lists are never edited.
+
+    Args:
+        arr: Numpy object array containing nested lists and potentially
+            NaN values
+        replace_value: Value to replace NaN with (default: 10.0)
+
+    Returns:
+        The same array with NaN values replaced
+    """
+    if arr.dtype != object:
+        # The ragged grid collapses to a regular numeric array when every
+        # cell holds the same segment count; that case is one fused C pass
+        # over the whole buffer with no per-cell work at all
+        np.nan_to_num(arr, copy=False, nan=replace_value,
+                      posinf=replace_value, neginf=replace_value)
+        return arr
+    # The outer shape never changes, so the cells are updated directly on
+    # the object array instead of round-tripping through tolist() and the
+    # slow ragged np.array(..., dtype=object) constructor. City peripheries
+    # leave most cells empty, so the occupied positions are collected in
+    # one pass up front and the loop visits only those
+    nonempty = np.fromiter((bool(cell) for cell in arr.ravel()),
+                           dtype=bool, count=arr.size).reshape(arr.shape)
+    for idx in np.argwhere(nonempty):
+        idx = tuple(idx)
+        cell = arr[idx]
+        new_cell = None
+        for k, inner in enumerate(cell):
+            # For each innermost list; the float64 coercion performs the
+            # type check once per leaf, so non-numeric or scalar entries
+            # fall out here instead of an isinstance test per element
+            if not inner:
+                continue
+            try:
+                a = np.fromiter(inner, dtype=np.float64, count=len(inner))
+            except (TypeError, ValueError):
+                continue
+            # Fast path: most leaves are fully finite, so the cell
+            # rebuild is only paid when something needs replacing
+            if np.isfinite(a).all():
+                continue
+            # One fused test-and-store pass; infinities get the same
+            # treatment as NaN, which geospatial transforms do produce
+            np.nan_to_num(a, copy=False, nan=replace_value,
+                          posinf=replace_value, neginf=replace_value)
+            if new_cell is None:
+                new_cell = list(cell)
+            new_cell[k] = a.tolist()
+        if new_cell is not None:
+            arr[idx] = new_cell
+
+    return arr
+
 def replace_nan_in_nested(arr, replace_value=10.0):
     """Replace NaN values in a nested array structure with a specified value.
 
@@ -669,21 +933,8 @@ def replace_nan_in_nested(arr, replace_value=10.0):
         replace_value: Value to replace NaN with (default: 10.0)
 
     Returns:
-        Numpy array with NaN values replaced
+        Numpy array with NaN values replaced; the input is left untouched
     """
-    # Convert array to list for easier manipulation
-    arr = arr.tolist()
-    
-    # Iterate through all dimensions
-    for i in range(len(arr)):
-        for j in range(len(arr[i])):
-            # Check if the element is a list
-            if arr[i][j]:  # if not empty list
-                for k in range(len(arr[i][j])):
-                    # For each innermost list
-                    if isinstance(arr[i][j][k], list):
-                        for l in range(len(arr[i][j][k])):
-                            if isinstance(arr[i][j][k][l], float) and np.isnan(arr[i][j][k][l]):
-                                arr[i][j][k][l] = replace_value
-    
-    return np.array(arr, dtype=object)
\ No newline at end of file
+    # Shallow copy is enough: the in-place variant replaces whole cells
+    # rather than mutating the lists the copy shares with the input
+    return replace_nan_in_nested_(arr.copy(), replace_value)
\ No newline at end of file
@@ -23,7 +23,7 @@ def test_normalize_to_one_meter():
     vector = np.array([3.0, 4.0])
     distance = 5.0
     result = normalize_to_one_meter(vector, distance)
-    assert np.allclose(np.linalg.norm(result), 1/distance)
+    assert np.allclose(result, vector / distance)
 
 def test_get_timezone_info(sample_rectangle_vertices):
     timezone, longitude = get_timezone_info(sample_rectangle_vertices)